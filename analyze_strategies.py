@@ -1,46 +1,18 @@
 import random
 import csv
-from utils import WordleHelper, FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE
+from core.helper import WordleHelper, FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE
+from core.simulation import simulate_many
 
-def get_feedback(secret, guess):
-    feedback = ['X'] * 5
-    secret_list = list(secret)
-    guess_list = list(guess)
-    # Greens
-    for i in range(5):
-        if guess_list[i] == secret_list[i]:
-            feedback[i] = 'G'
-            secret_list[i] = None
-            guess_list[i] = None
-    # Yellows
-    for i in range(5):
-        if guess_list[i] is not None and guess_list[i] in secret_list:
-            feedback[i] = 'Y'
-            idx = secret_list.index(guess_list[i])
-            secret_list[idx] = None
-    return ''.join(feedback)
-
-def simulate_game(secret, mode, random_top=None):
-    helper = WordleHelper(mode=mode)
-    for attempt in range(1, 7):
-        if random_top != None:
-            top_guesses = helper.get_top_guesses(random_top)
-            if not top_guesses:
-                return 7  # failed
-            guess = random.choice(top_guesses)
-        else:
-            guess = helper.get_best_guess()
-            if guess is None:
-                return 7  # failed
-        feedback = get_feedback(secret, guess)
-        if feedback == 'GGGGG':
-            return attempt
-        helper.filter_words(guess, feedback)
-    return 7  # failed
+def random_top_chooser(random_top):
+    """從前 random_top 名中隨機挑一個 (沒有候選字時回傳 None，記為失敗)"""
+    def choose(helper):
+        top_guesses = helper.get_top_guesses(random_top)
+        return random.choice(top_guesses) if top_guesses else None
+    return choose
 
 def main():
     words = WordleHelper.read_words()
-    answers = WordleHelper.read_words('data/answers.csv')
+    answers = WordleHelper.read_past_answers()
     possible = [word for word in words if word not in answers]
     modes = [FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE]
     mode_names = {
@@ -55,14 +27,13 @@ def main():
         # strategies.append((mode, 5, f"{mode_names[mode]} (Random Top 5)"))
         # strategies.append((mode, 10, f"{mode_names[mode]} (Random Top 10)"))
 
-    results = {strategy[2]: [] for strategy in strategies}
+    results = {}
 
     print("Analyzing strategies... This may take a few minutes.")
     for mode, random_top, name in strategies:
         print(f"Simulating {name} strategy...")
-        for secret in possible:
-            guesses = simulate_game(secret, mode, random_top)
-            results[name].append(guesses)
+        choose = random_top_chooser(random_top) if random_top is not None else None
+        results[name] = simulate_many(possible, 'standard', mode=mode, choose=choose).guesses
 
     print("\nResults:")
     for name in results:
@@ -1,76 +1,136 @@
-from flask import Flask, render_template, request, session, jsonify
+from flask import Flask, Response, render_template, request, session, jsonify, stream_with_context
+import json
 import random
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from core.helper import WordleHelper
+from core.helper import FREQ_ENTROPY, FREQ_TREE
+from core.solver import has_strategy_tree
+from core.cache import score_cache
+from core.metrics import metrics
+from core.vocab import vocabulary_store
 from play_wordle import get_feedback
+from suggestion_service import SuggestionService
+from request_params import words_limit
+from game_store import Game, MemoryGameStore
 
 app = Flask(__name__)
 app.secret_key = 'wordle_secret_key'  # Change this in production
 
+# 每個 worker process 一個預先載入的建議引擎 (有策略樹時走樹，否則 Entropy)，每回合的耗時記錄在 metrics
+suggestion_service = SuggestionService(mode=FREQ_TREE if has_strategy_tree('standard') else FREQ_ENTROPY, on_turn=metrics)
+# 遊戲狀態存在伺服器端 (cookie session 只有 game id)；多個 process 時可換成共用的 GameStore 實作
+game_store = MemoryGameStore()
+
+def current_game():
+    game_id = session.get('game_id')
+    return game_id, game_store.get(game_id)
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
 @app.route('/new_game', methods=['POST'])
 def new_game():
-    words = WordleHelper.read_words()
-    session['secret'] = random.choice(words)
-    session['attempts'] = []
-    session['won'] = False
-    session['lost'] = False
+    game_id = game_store.new_id()
+    game_store.put(game_id, Game(random.choice(vocabulary_store.index().words)))
+    session['game_id'] = game_id
     return jsonify({'status': 'new_game'})
 
 @app.route('/guess', methods=['POST'])
 def guess():
     data = request.get_json()
     guess = data['guess'].strip().upper()
-    words = WordleHelper.read_words()
-    if len(guess) != 5 or not guess.isalpha() or guess not in words:
+    # 共用的詞彙索引：O(1) 查詢，檔案變動時自動重建
+    if len(guess) != 5 or not guess.isalpha() or guess not in vocabulary_store.index():
         return jsonify({'error': 'Invalid guess'}), 400
 
-    if 'secret' not in session:
+    game_id, game = current_game()
+    if game is None:
         return jsonify({'error': 'No active game'}), 400
 
-    secret = session['secret']
-    feedback = get_feedback(secret, guess)
-    session['attempts'].append({'guess': guess, 'feedback': feedback})
-    session.modified = True
+    feedback = get_feedback(game.secret, guess)
+    game.attempts.append({'guess': guess, 'feedback': feedback})
 
     if feedback == 'GGGGG':
-        session['won'] = True
-    elif len(session['attempts']) >= 6:
-        session['lost'] = True
+        game.won = True
+    elif len(game.attempts) >= 6:
+        game.lost = True
+    else:
+        # 只過濾最新一手 (從上一手的候選字 bitset 開始)，評分留給 /suggestions
+        suggestion_service.advance(game)
+    game_store.put(game_id, game)
 
     response = {
         'feedback': feedback,
-        'won': session.get('won', False),
-        'lost': session.get('lost', False),
-        'attempts': session['attempts']
+        'won': game.won,
+        'lost': game.lost,
+        'attempts': game.attempts
     }
-    if session.get('lost', False):
-        response['secret'] = secret
+    if game.lost:
+        response['secret'] = game.secret
     return jsonify(response)
 
+@app.route('/words', methods=['GET'])
+def words_lookup():
+    """自動完成：?prefix=CR (字首) 或 ?pattern=CR_NE (位置 pattern，_ 為任意字母)"""
+    index = vocabulary_store.index()
+    try:
+        limit = words_limit(request.args.get('limit'))
+        if 'pattern' in request.args:
+            words = index.matching(request.args['pattern'], limit)
+        else:
+            words = index.prefix(request.args.get('prefix', ''), limit)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'words': words})
+
 @app.route('/suggestions', methods=['GET'])
 def suggestions():
-    if 'secret' not in session or session.get('won') or session.get('lost'):
+    game_id, game = current_game()
+    if game is None or not game.active:
         return jsonify({'suggestions': [], 'count': 0})
 
     offset = int(request.args.get('offset', 0))
     limit = int(request.args.get('limit', 10))
 
-    helper = WordleHelper()
-    # Filter based on previous attempts
-    for attempt in session['attempts']:
-        helper.filter_words(attempt['guess'], attempt['feedback'])
+    # 同一回合已算過的排名直接分頁；否則從 game.state 還原，只計算需要的前 offset + limit 名
+    suggestions, count = suggestion_service.game_suggestions(game, offset, limit)
+    game_store.put(game_id, game)
+    return jsonify({'suggestions': suggestions, 'count': count})
+
+@app.route('/suggestions/stream', methods=['GET'])
+def suggestions_stream():
+    """
+    Server-Sent Events 版的 /suggestions (第一頁)：立即送出暫定排名，
+    Entropy 分批計算時逐步送出修正後的排名，最後一筆的 final 為 true
+    """
+    game_id, game = current_game()
+    if game is None or not game.active:
+        events = [{'suggestions': [], 'count': 0, 'final': True}]
+    else:
+        events = suggestion_service.stream(game, int(request.args.get('limit', 10)))
+
+    def generate():
+        for event in events:
+            yield f"data: {json.dumps(event)}\n\n"
+        if game is not None:
+            # 最終排名已存入 game，之後的分頁直接使用
+            game_store.put(game_id, game)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
-    all_suggestions = helper.get_top_guesses(len(helper.words))  # Get all to slice
-    suggestions = all_suggestions[offset:offset + limit]
-    return jsonify({'suggestions': suggestions, 'count': len(helper.words)})
+@app.route('/metrics', methods=['GET'])
+def metrics_report():
+    # 本 worker process 的每回合耗時彙總 (各階段時間、慢回合) 與快取狀態
+    report = metrics.snapshot()
+    report['score_cache'] = score_cache.stats()
+    report['cached_states'] = suggestion_service.cached_states()
+    report['game_store'] = game_store.stats()
+    return jsonify(report)
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=8000, debug=True)
@@ -0,0 +1,228 @@
+"""
+asyncio 版的網頁後端 (aiohttp)，介面與 app.py 相同，前端不需修改。
+請求都在 event loop 上處理；WordleHelper 評分交給 ScoringPool 的 process pool，
+每個請求有期限 (逾時回 504)，排隊的工作太多時立即回 503 (backpressure)。
+遊戲狀態存在伺服器端的 GameStore (以 cookie 中的 game id 查詢)。
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+from aiohttp import web
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.helper import FREQ_ENTROPY, FREQ_TREE
+from core.solver import has_strategy_tree
+from core.simulation import get_feedback
+from core.vocab import vocabulary_store
+from scoring_pool import ScoringPool, Overloaded, DeadlineExceeded, DEFAULT_DEADLINE, QUEUE_PER_WORKER
+from request_params import words_limit
+from game_store import Game, GameStore, MemoryGameStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GAME_COOKIE = 'game'
+MAX_ATTEMPTS = 6
+
+
+POOL = web.AppKey('pool', ScoringPool)
+GAMES = web.AppKey('games', GameStore)
+
+
+def _error(status, message):
+    return web.json_response({'error': message}, status=status)
+
+
+async def index(request):
+    return web.FileResponse(os.path.join(BASE_DIR, 'templates', 'index.html'))
+
+
+def _current_game(request):
+    game_id = request.cookies.get(GAME_COOKIE)
+    return game_id, request.app[GAMES].get(game_id)
+
+
+async def new_game(request):
+    store = request.app[GAMES]
+    game_id = store.new_id()
+    store.put(game_id, Game(random.choice(vocabulary_store.index().words)))
+    response = web.json_response({'status': 'new_game'})
+    response.set_cookie(GAME_COOKIE, game_id, httponly=True, samesite='Lax')
+    return response
+
+
+async def guess(request):
+    data = await request.json()
+    guess = data['guess'].strip().upper()
+    if len(guess) != 5 or not guess.isalpha() or guess not in vocabulary_store.index():
+        return _error(400, 'Invalid guess')
+
+    game_id, game = _current_game(request)
+    if game is None:
+        return _error(400, 'No active game')
+
+    feedback = get_feedback(game.secret, guess)
+    game.attempts.append({'guess': guess, 'feedback': feedback})
+    if feedback == 'GGGGG':
+        game.won = True
+    elif len(game.attempts) >= MAX_ATTEMPTS:
+        game.lost = True
+    # 候選字在 worker 中過濾 (下一次 /suggestions 從 game.state 只過濾最新一手)
+    game.set_rankings(None, 0)
+    request.app[GAMES].put(game_id, game)
+
+    response = {
+        'feedback': feedback,
+        'won': game.won,
+        'lost': game.lost,
+        'attempts': game.attempts,
+    }
+    if game.lost:
+        response['secret'] = game.secret
+    return web.json_response(response)
+
+
+async def words_lookup(request):
+    """自動完成：?prefix=CR (字首) 或 ?pattern=CR_NE (位置 pattern，_ 為任意字母)"""
+    index = vocabulary_store.index()
+    try:
+        limit = words_limit(request.query.get('limit'))
+        if 'pattern' in request.query:
+            words = index.matching(request.query['pattern'], limit)
+        else:
+            words = index.prefix(request.query.get('prefix', ''), limit)
+    except ValueError as e:
+        return _error(400, str(e))
+    return web.json_response({'words': words})
+
+
+def _active_game(request):
+    game_id, game = _current_game(request)
+    if game is None or not game.active:
+        return game_id, None
+    return game_id, game
+
+
+def _save_result(request, game_id, game, attempts, state, count, rankings=None, top_n=0):
+    """pool 的結果存回遊戲 (請求期間遊戲可能已經往前走，只存對應目前 attempts 的結果)"""
+    if len(game.attempts) != len(attempts):
+        return
+    game.state = state
+    game.count = count
+    if rankings is not None:
+        game.set_rankings(rankings, top_n)
+    request.app[GAMES].put(game_id, game)
+
+
+async def suggestions(request):
+    game_id, game = _active_game(request)
+    if game is None:
+        return web.json_response({'suggestions': [], 'count': 0})
+
+    offset = max(0, int(request.query.get('offset', 0)))
+    limit = max(0, int(request.query.get('limit', 10)))
+    top_n = offset + limit
+    # 同一回合已算過的排名直接分頁
+    if game.has_rankings(top_n):
+        return web.json_response({'suggestions': game.rankings[offset:top_n], 'count': game.count})
+
+    attempts = list(game.attempts)
+    try:
+        rankings, count, state = await request.app[POOL].suggest(attempts, 0, top_n, game.state)
+    except Overloaded:
+        return _error(503, 'Server busy, please retry')
+    except DeadlineExceeded:
+        return _error(504, 'Suggestions took too long')
+    _save_result(request, game_id, game, attempts, state, count, rankings, top_n)
+    return web.json_response({'suggestions': rankings[offset:top_n], 'count': count})
+
+
+async def suggestions_stream(request):
+    """/suggestions/stream：先送出 worker 立即可得的暫定排名，完整排名算好後再送出最後一筆"""
+    game_id, game = _active_game(request)
+    pool = request.app[POOL]
+    limit = max(0, int(request.query.get('limit', 10)))
+    attempts = list(game.attempts) if game is not None else []
+
+    try:
+        if game is None:
+            first = ([], 0, True)
+        elif game.has_rankings(limit):
+            first = (game.rankings[:limit], game.count, True)
+        else:
+            first = await pool.quick(attempts, limit, game.state)
+    except Overloaded:
+        return _error(503, 'Server busy, please retry')
+    except DeadlineExceeded:
+        return _error(504, 'Suggestions took too long')
+
+    response = web.StreamResponse(headers={'Content-Type': 'text/event-stream', 'Cache-Control': 'no-cache'})
+    await response.prepare(request)
+
+    async def send(suggestions, count, final):
+        event = {'suggestions': suggestions, 'count': count, 'final': final}
+        await response.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+
+    suggestions, count, final = first
+    await send(suggestions, count, final)
+    if not final:
+        try:
+            suggestions, count, state = await pool.suggest(attempts, 0, limit, game.state)
+            _save_result(request, game_id, game, attempts, state, count, suggestions, limit)
+        except (Overloaded, DeadlineExceeded):
+            # 暫定排名已經送出，就以它為最終結果
+            pass
+        await send(suggestions, count, True)
+    await response.write_eof()
+    return response
+
+
+async def metrics_report(request):
+    # 評分在 worker process 中進行，這裡只回報 pool 的排隊 / 逾時狀況
+    report = request.app[POOL].stats()
+    report['game_store'] = request.app[GAMES].stats()
+    return web.json_response(report)
+
+
+def create_app(workers=None, max_pending=None, deadline=DEFAULT_DEADLINE):
+    app = web.Application()
+    mode = FREQ_TREE if has_strategy_tree('standard') else FREQ_ENTROPY
+    app[POOL] = ScoringPool(workers, max_pending, deadline, mode=mode)
+    app[GAMES] = MemoryGameStore()
+
+    async def on_startup(app):
+        await app[POOL].warm_up()
+
+    async def on_cleanup(app):
+        app[POOL].shutdown()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_get('/', index)
+    app.router.add_post('/new_game', new_game)
+    app.router.add_post('/guess', guess)
+    app.router.add_get('/words', words_lookup)
+    app.router.add_get('/suggestions', suggestions)
+    app.router.add_get('/suggestions/stream', suggestions_stream)
+    app.router.add_get('/metrics', metrics_report)
+    app.router.add_static('/static', os.path.join(BASE_DIR, 'static'))
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WordMaster web app (asyncio server with a scoring process pool)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help='Scoring processes (default: CPU count)')
+    parser.add_argument('--max_pending', type=int, default=None, help=f'Queued scoring jobs before answering 503 (default: {QUEUE_PER_WORKER} per worker)')
+    parser.add_argument('--deadline_ms', type=int, default=int(DEFAULT_DEADLINE * 1000), help='Per-request scoring deadline; slower requests get 504 (default: 2000)')
+    args = parser.parse_args()
+
+    app = create_app(args.workers, args.max_pending, args.deadline_ms / 1000)
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
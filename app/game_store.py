@@ -0,0 +1,140 @@
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from core.cache import LRUDict
+
+# 同時保留的遊戲數與閒置多久後丟棄 (秒)
+DEFAULT_MAX_GAMES = 10000
+DEFAULT_TTL = 6 * 60 * 60
+
+
+class Game:
+    """
+    一局遊戲的伺服器端狀態：
+    - state: 目前候選字的 WordleHelper.export_state() (bitset，數百 bytes)
+    - count: 目前候選字數
+    - rankings: 目前回合已算出的前 ranked 名建議 (候選字不足時可能較短)，下一手之前直接分頁回傳
+    to_dict / from_dict 只有 JSON 相容的欄位，外部儲存 (例如 Redis) 以此序列化。
+    """
+
+    __slots__ = ('secret', 'attempts', 'won', 'lost', 'state', 'count', 'rankings', 'ranked')
+
+    def __init__(self, secret, attempts=None, won=False, lost=False, state=None, count=None, rankings=None, ranked=0):
+        self.secret = secret
+        self.attempts = attempts if attempts is not None else []
+        self.won = won
+        self.lost = lost
+        self.state = state
+        self.count = count
+        self.rankings = rankings
+        self.ranked = ranked
+
+    def has_rankings(self, top_n):
+        return self.rankings is not None and top_n <= self.ranked
+
+    def set_rankings(self, rankings, top_n):
+        self.rankings = rankings
+        self.ranked = top_n
+
+    @property
+    def active(self):
+        return not (self.won or self.lost)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+class GameStore(ABC):
+    """
+    game id -> Game 的儲存介面。實作需要 thread-safe；
+    put 之後的修改不保證寫回，改完要再 put 一次 (外部儲存是以序列化後的值保存)。
+    """
+
+    def new_id(self):
+        return secrets.token_urlsafe(16)
+
+    @abstractmethod
+    def get(self, game_id):
+        ...
+
+    @abstractmethod
+    def put(self, game_id, game):
+        ...
+
+    @abstractmethod
+    def delete(self, game_id):
+        ...
+
+    @abstractmethod
+    def __len__(self):
+        ...
+
+
+class MemoryGameStore(GameStore):
+    """Process 內的 GameStore：LRU (最多 max_games 局) 加上閒置 ttl 秒後過期，直接保存 Game 物件"""
+
+    def __init__(self, max_games=DEFAULT_MAX_GAMES, ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._games = LRUDict(max_games)  # game id -> (到期時間, Game)
+        # 過期檢查 + 讀寫要一起完成
+        self._lock = threading.Lock()
+        self.expirations = 0
+
+    @property
+    def max_games(self):
+        return self._games.max_entries
+
+    @property
+    def evictions(self):
+        return self._games.evictions
+
+    def _expire(self, now):
+        # 依使用順序排列，最久沒用的沒過期就不必再往後看
+        while True:
+            oldest = self._games.oldest()
+            if oldest is None or oldest[1][0] > now:
+                break
+            self._games.pop(oldest[0])
+            self.expirations += 1
+
+    def get(self, game_id):
+        if not game_id:
+            return None
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._games.get(game_id)
+            if entry is None:
+                return None
+            self._games.put(game_id, (now + self.ttl, entry[1]))
+            return entry[1]
+
+    def put(self, game_id, game):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._games.put(game_id, (now + self.ttl, game))
+
+    def delete(self, game_id):
+        self._games.pop(game_id)
+
+    def __len__(self):
+        with self._lock:
+            self._expire(self._clock())
+            return len(self._games)
+
+    def stats(self):
+        return {
+            'games': len(self._games),
+            'max_games': self.max_games,
+            'ttl_s': self.ttl,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
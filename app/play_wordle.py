@@ -1,24 +1,13 @@
 import random
 import argparse
-from utils import WordleHelper
+import sys
+import os
 
-def get_feedback(secret, guess):
-    feedback = ['X'] * 5
-    secret_list = list(secret)
-    guess_list = list(guess)
-    # Greens
-    for i in range(5):
-        if guess_list[i] == secret_list[i]:
-            feedback[i] = 'G'
-            secret_list[i] = None
-            guess_list[i] = None
-    # Yellows
-    for i in range(5):
-        if guess_list[i] is not None and guess_list[i] in secret_list:
-            feedback[i] = 'Y'
-            idx = secret_list.index(guess_list[i])
-            secret_list[idx] = None
-    return ''.join(feedback)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.helper import WordleHelper
+from core.simulation import get_feedback
+from core.vocab import vocabulary_store
 
 def main():
     parser = argparse.ArgumentParser()
@@ -26,6 +15,7 @@ def main():
     args = parser.parse_args()
 
     words = WordleHelper.read_words()
+    index = vocabulary_store.index()  # O(1) 查詢 (與 WordleHelper 共用同一份詞彙表)
     secret = random.choice(words)
     if not args.quiet:
         print("Welcome to Wordle!")
@@ -37,7 +27,7 @@ def main():
         if len(guess) != 5 or not guess.isalpha():
             print("Please enter a 5-letter word.")
             continue
-        if guess not in words:
+        if guess not in index:
             print("Word not in vocabulary.")
             continue
         feedback = get_feedback(secret, guess)
@@ -0,0 +1,20 @@
+# /words 一次最多回傳的單字數
+MAX_WORDS_LIMIT = 50
+DEFAULT_WORDS_LIMIT = 10
+
+
+def words_limit(value):
+    """
+    解析 /words 的 limit (app.py 與 async_app.py 共用)：
+    未指定時為 DEFAULT_WORDS_LIMIT，超過 MAX_WORDS_LIMIT 時以上限計；
+    不是正整數時丟出 ValueError (回 400)
+    """
+    if value is None:
+        return DEFAULT_WORDS_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError(f"limit must be an integer: {value!r}")
+    if limit < 1:
+        raise ValueError(f"limit must be positive: {limit}")
+    return min(limit, MAX_WORDS_LIMIT)
@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from suggestion_service import SuggestionService
+
+# 每個 worker 平均可排隊的工作數 (超過時直接拒絕，回 503)
+QUEUE_PER_WORKER = 4
+# 每個請求的預設期限 (秒)
+DEFAULT_DEADLINE = 2.0
+
+
+class Overloaded(Exception):
+    """排隊中的工作已達上限 (backpressure)"""
+
+
+class DeadlineExceeded(Exception):
+    """工作沒有在期限內完成"""
+
+
+# --- worker process 端 ---
+
+_service = None
+
+
+def _init_worker(helper_kwargs):
+    # 每個 worker process 啟動時建立一次引擎 (詞彙表、開局書、pattern 矩陣各自載入)
+    global _service
+    _service = SuggestionService(**helper_kwargs)
+
+
+def _suggest(attempts, offset, limit, saved_state):
+    """回傳 (suggestions, count, 狀態)；狀態存回遊戲，下一個請求落到別的 worker 時可直接還原"""
+    suggestions, count = _service.suggest(attempts, offset, limit, saved_state)
+    return suggestions, count, _service.state_for(attempts).export_state()
+
+
+def _quick(attempts, limit, saved_state):
+    """回傳 (suggestions, count, final)：評分已完成時是最終排名，否則是 Frequency 暫定排名"""
+    helper = _service.state_for(attempts, saved_state)
+    if helper.scores_pending:
+        return helper.quick_guesses(limit), len(helper.words), False
+    return helper.get_top_guesses(limit), len(helper.words), True
+
+
+# --- event loop 端 ---
+
+class ScoringPool:
+    """
+    把 WordleHelper 的評分丟到固定大小的 process pool，event loop 只負責處理請求。
+    - backpressure: 尚未完成的工作 (含已逾時但仍在執行的) 達 max_pending 時立即丟出 Overloaded
+    - deadline: 每個請求等待的上限，逾時丟出 DeadlineExceeded (尚未開始的工作會被取消)
+    所有方法都只能在同一個 event loop 中呼叫。
+    """
+
+    def __init__(self, workers=None, max_pending=None, deadline=DEFAULT_DEADLINE, **helper_kwargs):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * QUEUE_PER_WORKER
+        self.deadline = deadline
+        self._executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(helper_kwargs,))
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def _done(self, _future):
+        self.pending -= 1
+        self.completed += 1
+
+    def _release(self, loop, future):
+        # shutdown 之後才結束 / 被取消的工作：event loop 可能已經關閉，不必再更新計數
+        if loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._done, future)
+        except RuntimeError:
+            # is_closed 檢查之後才關閉 (不同 thread)
+            pass
+
+    async def run(self, fn, *args, deadline=None):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded()
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(fn, *args)
+        self.pending += 1
+        # 以工作實際結束為準釋放名額 (callback 在 pool 的 thread 執行，轉回 event loop)
+        future.add_done_callback(lambda f: self._release(loop, f))
+        timeout = deadline if deadline is not None else self.deadline
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise DeadlineExceeded()
+
+    async def suggest(self, attempts, offset, limit, saved_state=None):
+        return await self.run(_suggest, attempts, offset, limit, saved_state)
+
+    async def quick(self, attempts, limit, saved_state=None):
+        return await self.run(_quick, attempts, limit, saved_state)
+
+    async def warm_up(self):
+        # 同時送出 workers 個工作，讓每個 worker process 都先啟動並完成初始化 (不受期限限制)
+        futures = [self._executor.submit(_quick, [], 1, None) for _ in range(self.workers)]
+        await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'deadline_ms': self.deadline * 1000 if self.deadline is not None else None,
+            'pending': self.pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,9 +1,12 @@
 document.addEventListener('DOMContentLoaded', function() {
     const messageDiv = document.getElementById('message');
     const suggestionList = document.getElementById('suggestion-list');
+    const completionList = document.getElementById('completions');
+    let completionRequest = 0;
     let currentRow = 0;
     let currentCol = 0;
     let suggestionsOffset = 0;
+    let suggestionStream = null;
     let gameOver = false;
 
     function startNewGame() {
@@ -12,6 +15,7 @@ document.addEventListener('DOMContentLoaded', function() {
             .then(data => {
                 if (data.status === 'new_game') {
                     resetBoard();
+                    clearCompletions();
                     messageDiv.innerHTML = '';
                     document.getElementById('new-game-container').innerHTML = '';
                     gameOver = false;
@@ -103,43 +107,114 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         currentRow++;
         currentCol = 0;
+        clearCompletions();
     }
 
-    function updateSuggestions() {
-        suggestionsOffset = 0;
-        fetch(`/suggestions?offset=${suggestionsOffset}&limit=10`)
+    function clearCompletions() {
+        completionRequest++;
+        completionList.innerHTML = '';
+    }
+
+    function updateCompletions() {
+        // Autocomplete the letters typed so far in the current row
+        const letters = document.getElementById(`row-${currentRow}`).querySelectorAll('.letter');
+        let prefix = '';
+        for (let i = 0; i < currentCol; i++) {
+            prefix += letters[i].textContent;
+        }
+        if (prefix.length === 0 || prefix.length === 5) {
+            clearCompletions();
+            return;
+        }
+        const request = ++completionRequest;
+        fetch(`/words?prefix=${encodeURIComponent(prefix)}&limit=8`)
             .then(response => response.json())
             .then(data => {
-                suggestionList.innerHTML = '';
-                data.suggestions.forEach(suggestion => {
+                // Ignore answers to older keystrokes
+                if (request !== completionRequest || !data.words) return;
+                completionList.innerHTML = '';
+                data.words.forEach(word => {
                     const li = document.createElement('li');
-                    li.textContent = suggestion;
-                    li.style.cursor = 'pointer';
+                    li.textContent = word;
                     li.addEventListener('click', function() {
-                        fillRowWithSuggestion(suggestion);
-                        submitGuess();
+                        fillRowWithSuggestion(word);
+                        clearCompletions();
                     });
-                    suggestionList.appendChild(li);
+                    completionList.appendChild(li);
                 });
-                // Remove existing more button
-                const existingMore = document.querySelector('.load-more');
-                if (existingMore) existingMore.remove();
-                if (data.suggestions.length >= 10 && data.count > 10) {
-                    const moreBtn = document.createElement('button');
-                    moreBtn.textContent = 'More';
-                    moreBtn.classList.add('load-more');
-                    moreBtn.addEventListener('click', loadMoreSuggestions);
-                    document.getElementById('suggestions').appendChild(moreBtn);
-                }
-                document.querySelector('#suggestions summary').textContent = `Suggestions (${data.count})`;
             });
     }
 
+    function renderSuggestions(data, final) {
+        // 503 (server busy) / 504 (deadline exceeded): keep the current list
+        if (data.error) return;
+        suggestionList.innerHTML = '';
+        data.suggestions.forEach(suggestion => {
+            const li = document.createElement('li');
+            li.textContent = suggestion;
+            li.style.cursor = 'pointer';
+            li.addEventListener('click', function() {
+                fillRowWithSuggestion(suggestion);
+                submitGuess();
+            });
+            suggestionList.appendChild(li);
+        });
+        // Remove existing more button
+        const existingMore = document.querySelector('.load-more');
+        if (existingMore) existingMore.remove();
+        // Only page through the final ranking
+        if (final && data.suggestions.length >= 10 && data.count > 10) {
+            const moreBtn = document.createElement('button');
+            moreBtn.textContent = 'More';
+            moreBtn.classList.add('load-more');
+            moreBtn.addEventListener('click', loadMoreSuggestions);
+            document.getElementById('suggestions').appendChild(moreBtn);
+        }
+        const status = final ? '' : ' …';
+        document.querySelector('#suggestions summary').textContent = `Suggestions (${data.count})${status}`;
+    }
+
+    function updateSuggestions() {
+        suggestionsOffset = 0;
+        // A newer request replaces any ranking that is still streaming
+        if (suggestionStream) {
+            suggestionStream.close();
+            suggestionStream = null;
+        }
+        if (!window.EventSource) {
+            fetch(`/suggestions?offset=${suggestionsOffset}&limit=10`)
+                .then(response => response.json())
+                .then(data => renderSuggestions(data, true));
+            return;
+        }
+        // Provisional ranking first, refined live as entropy scoring progresses
+        const stream = new EventSource('/suggestions/stream?limit=10');
+        suggestionStream = stream;
+        stream.onmessage = function(event) {
+            if (stream !== suggestionStream) return;
+            const data = JSON.parse(event.data);
+            renderSuggestions(data, data.final);
+            if (data.final) {
+                stream.close();
+                suggestionStream = null;
+            }
+        };
+        stream.onerror = function() {
+            // Do not let the browser reconnect and restart the computation
+            stream.close();
+            if (stream === suggestionStream) suggestionStream = null;
+        };
+    }
+
     function loadMoreSuggestions() {
         suggestionsOffset += 10;
         fetch(`/suggestions?offset=${suggestionsOffset}&limit=10`)
             .then(response => response.json())
             .then(data => {
+                if (data.error) {
+                    suggestionsOffset -= 10;
+                    return;
+                }
                 // Remove existing more button
                 const existingMore = document.querySelector('.load-more');
                 if (existingMore) existingMore.remove();
@@ -183,10 +258,12 @@ document.addEventListener('DOMContentLoaded', function() {
             if (currentCol > 0) {
                 currentCol--;
                 letters[currentCol].textContent = '';
+                updateCompletions();
             }
         } else if (key.length === 1 && key.match(/[a-zA-Z]/) && currentCol < 5) {
             letters[currentCol].textContent = key.toUpperCase();
             currentCol++;
+            updateCompletions();
         }
     }
 
@@ -0,0 +1,133 @@
+from core.cache import LRUDict
+from core.helper import WordleHelper
+
+# 每個 worker process 保留的中間狀態數量 (attempts 前綴 -> helper)
+MAX_CACHED_STATES = 2048
+
+
+class SuggestionService:
+    """
+    /suggestions 的後端：每個 worker process 只建立一次引擎 (詞彙表、開局書在啟動時載入)。
+    每個 attempts 前綴的中間狀態都會快取，新的請求只需從最長的已知前綴往下過濾，
+    並且只計算 client 要求的前 offset + limit 名。
+    快取沒有命中時 (例如請求落到另一個 worker)，可以用 session 中的 export_state() 直接還原，不必重播。
+    重播時不評分 (deferred)，排名在 suggest / stream 需要時才計算，stream 可以先送出暫定排名。
+    """
+
+    def __init__(self, max_states=MAX_CACHED_STATES, **helper_kwargs):
+        self.max_states = max_states
+        self._root = WordleHelper(**helper_kwargs)
+        self._states = LRUDict(max_states)
+
+    @staticmethod
+    def _key(attempts):
+        return tuple((a['guess'].upper(), a['feedback'].upper()) for a in attempts)
+
+    def _get_cached(self, key):
+        return self._states.get(key)
+
+    def _put(self, key, helper):
+        self._states.put(key, helper)
+
+    def _restore(self, key, saved_state):
+        """saved_state 的歷史是 key 的前綴時還原成 helper，否則回傳 None"""
+        if not saved_state:
+            return None
+        history = tuple((g, f) for g, f in saved_state.get('history', ()))
+        if not history or key[:len(history)] != history:
+            return None
+        try:
+            helper = self._root.clone().restore_state(saved_state, deferred=True)
+        except (ValueError, KeyError, TypeError):
+            return None
+        self._put(history, helper)
+        return helper
+
+    def state_for(self, attempts, saved_state=None):
+        """
+        回傳對應 attempts 的 helper (共用，呼叫端不可修改)。
+        saved_state: 先前 export_state() 的結果，快取的前綴比它短時以它為起點
+        """
+        key = self._key(attempts)
+        if not key:
+            return self._root
+
+        # 找最長的已快取前綴
+        depth = len(key)
+        helper = None
+        while depth > 0:
+            helper = self._get_cached(key[:depth])
+            if helper is not None:
+                break
+            depth -= 1
+        saved_depth = len(saved_state.get('history', ())) if saved_state else 0
+        if saved_depth > depth:
+            restored = self._restore(key, saved_state)
+            if restored is not None:
+                helper, depth = restored, saved_depth
+        if helper is None:
+            helper = self._root
+
+        # 只重播尚未快取的步驟，每一步的結果都存起來
+        for i in range(depth, len(key)):
+            helper = helper.clone()
+            helper.filter_words(*key[i], deferred=True)
+            self._put(key[:i + 1], helper)
+        return helper
+
+    def cached_states(self):
+        return len(self._states)
+
+    def suggest(self, attempts, offset=0, limit=10, saved_state=None):
+        """回傳 (suggestions, 剩餘候選字數)"""
+        helper = self.state_for(attempts, saved_state)
+        offset = max(0, offset)
+        limit = max(0, limit)
+        top = helper.get_top_guesses(offset + limit)
+        return top[offset:offset + limit], len(helper.words)
+
+    # --- 搭配 GameStore 的遊戲 (app/game_store.py) ---
+
+    def advance(self, game):
+        """
+        game.attempts 加入新的一手後呼叫：從 game.state (上一手的候選字 bitset) 還原，
+        只過濾最新一手 (不評分)，存回 state 並清掉上一回合的排名
+        """
+        helper = self.state_for(game.attempts, game.state)
+        game.state = helper.export_state()
+        game.count = len(helper.words)
+        game.set_rankings(None, 0)
+        return helper
+
+    def game_suggestions(self, game, offset=0, limit=10):
+        """回傳 (suggestions, 剩餘候選字數)；排名存在 game 中，同一回合的分頁不必重新計算"""
+        offset = max(0, offset)
+        top_n = offset + max(0, limit)
+        if game.has_rankings(top_n):
+            return game.rankings[offset:top_n], game.count
+        attempts = list(game.attempts)
+        helper = self.state_for(attempts, game.state)
+        rankings = helper.get_top_guesses(top_n)
+        # 計算期間遊戲可能已經往前走 (同一局的並行請求)，只存對應目前 attempts 的結果
+        if len(game.attempts) == len(attempts):
+            game.count = len(helper.words)
+            game.set_rankings(rankings, top_n)
+        return rankings[offset:top_n], len(helper.words)
+
+    def stream(self, game, limit=10):
+        """
+        漸進式建議：依序產生 {'suggestions', 'count', 'final'}。
+        第一筆是立即可得的暫定排名，之後隨 Entropy 分批計算逐步修正，最後一筆為完整排名 (存入 game)
+        """
+        limit = max(0, limit)
+        if game.has_rankings(limit):
+            yield {'suggestions': game.rankings[:limit], 'count': game.count, 'final': True}
+            return
+        attempts = list(game.attempts)
+        helper = self.state_for(attempts, game.state)
+        count = len(helper.words)
+        for suggestions, final in helper.iter_top_guesses(limit):
+            if final and len(game.attempts) == len(attempts):
+                game.count = count
+                game.set_rankings(suggestions, limit)
+            yield {'suggestions': suggestions, 'count': count, 'final': final}
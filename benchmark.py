@@ -0,0 +1,196 @@
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from core.helper import WordleHelper, FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE, FREQ_ENTROPY
+from core.cache import score_cache
+from core.lookahead import lookahead_scores
+from core.simulation import simulate_many, get_feedback
+from core._np import np
+from perfstats import percentile
+
+# 結果檔格式版本
+RESULT_VERSION = 1
+ENTROPY_SIZES = (10, 100, 500, 'all')
+LOOKAHEAD_NODES = 200
+
+
+def quiet():
+    """WordleHelper 會印出模式訊息，量測時關掉"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def measure(fn, repeat, warmup, setup=None):
+    """
+    執行 warmup 次 (不計) 後量測 repeat 次，回傳每次的秒數。
+    setup() 在每次量測前執行 (不計入時間)，回傳值傳給 fn。
+    """
+    samples = []
+    for i in range(warmup + repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg)
+        elapsed = time.perf_counter() - start
+        if i >= warmup:
+            samples.append(elapsed)
+    return samples
+
+
+def summarize(samples):
+    ms = [s * 1000 for s in samples]
+    return {
+        'median_ms': statistics.median(ms),
+        'p10_ms': percentile(ms, 0.10),
+        'p90_ms': percentile(ms, 0.90),
+        'min_ms': min(ms),
+        'max_ms': max(ms),
+        'repeat': len(ms),
+    }
+
+
+def build_cases(rng, games):
+    """
+    回傳 [(name, fn, setup)]。所有隨機輸入都在這裡以固定 seed 產生，
+    量測順序與內容在每次執行時都相同。
+    """
+    with quiet():
+        words = WordleHelper.read_words()
+        helpers = {mode: WordleHelper(mode=mode) for mode in (FREQ_UNIQUE, FREQ_ENTROPY)}
+    entropy_helper = helpers[FREQ_ENTROPY]
+    pairs = [(rng.choice(words), rng.choice(words)) for _ in range(1000)]
+    secrets = rng.sample(words, min(games, len(words)))
+    cases = []
+
+    # 1. 回饋計算
+    def feedback_pattern(_):
+        for secret, guess in pairs:
+            WordleHelper.get_feedback_pattern(secret, guess)
+    cases.append(('feedback_pattern[1000]', feedback_pattern, None))
+
+    def feedback_string(_):
+        for secret, guess in pairs:
+            get_feedback(secret, guess)
+    cases.append(('get_feedback[1000]', feedback_string, None))
+
+    # 2. 過濾 (第一手，從完整詞彙表開始；Entropy 模式的一致答案 bitset 在 warmup 後已快取)
+    filter_steps = [(guess, get_feedback(secret, guess)) for secret, guess in pairs[:50]]
+    for mode, helper in helpers.items():
+        def filter_words(_, helper=helper):
+            for guess, feedback in filter_steps:
+                helper.clone().filter_words(guess, feedback)
+        cases.append((f'filter_words[{mode},50]', filter_words, None))
+
+    # 3. Entropy 計算 (不經過評分快取)
+    for size in ENTROPY_SIZES:
+        candidates = words if size == 'all' else rng.sample(words, size)
+        def entropy(_, candidates=candidates):
+            entropy_helper.calculate_entropy(candidates)
+        cases.append((f'calculate_entropy[{size}]', entropy, None))
+
+    # 4. 各模式評分 (完整候選字表；Entropy 每次先清空快取)
+    char_count = entropy_helper.analyze_freq()
+    for mode in (FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE, FREQ_ENTROPY):
+        def score(_, mode=mode):
+            entropy_helper.score(mode, words, char_count)
+        setup = score_cache.clear if mode == FREQ_ENTROPY else None
+        cases.append((f'score[{mode}]', score, setup))
+    # Lookahead 以節點預算取代時間預算，每次的工作量固定
+    lookahead_candidates = rng.sample(words, 100)
+    def lookahead(_):
+        lookahead_scores(entropy_helper.patterns, words, lookahead_candidates, node_budget=LOOKAHEAD_NODES)
+    cases.append((f'lookahead_scores[100,{LOOKAHEAD_NODES} nodes]', lookahead, None))
+
+    # 5. 建立 helper
+    for mode in (FREQ_UNIQUE, FREQ_ENTROPY):
+        def construct(_, mode=mode):
+            with quiet():
+                WordleHelper(mode=mode)
+        cases.append((f'construct[{mode}]', construct, None))
+
+    # 6. 整局模擬
+    for mode in (FREQ_UNIQUE, FREQ_ENTROPY):
+        def simulate(_, mode=mode):
+            with quiet():
+                simulate_many(secrets, 'hybrid', mode=mode)
+        setup = score_cache.clear if mode == FREQ_ENTROPY else None
+        cases.append((f'simulate[{mode},{len(secrets)}]', simulate, setup))
+
+    return cases
+
+
+def compare(current, baseline, threshold):
+    """印出與基準結果的差異；回傳變慢超過 threshold 的項目"""
+    regressions = []
+    print(f"\n{'benchmark':<32}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>12}{result['median_ms']:>10.3f}ms{'new':>10}")
+            continue
+        change = result['median_ms'] / base['median_ms'] - 1 if base['median_ms'] else 0.0
+        flag = ' <-' if change > threshold else ''
+        print(f"{name:<32}{base['median_ms']:>10.3f}ms{result['median_ms']:>10.3f}ms{change:>+9.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='WordMaster benchmark suite for the core hot paths')
+    parser.add_argument('--repeat', type=int, default=15, help='Measured runs per benchmark (default: 15)')
+    parser.add_argument('--warmup', type=int, default=3, help='Unmeasured warmup runs per benchmark (default: 3)')
+    parser.add_argument('--seed', type=int, default=1234, help='Random seed for benchmark inputs (default: 1234)')
+    parser.add_argument('--games', type=int, default=200, help='Secrets per full-game simulation (default: 200)')
+    parser.add_argument('--filter', default=None, help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--output', default=None, help='Write results as JSON to this path')
+    parser.add_argument('--compare', default=None, help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Median slowdown reported as a regression (default: 0.10 = 10%%)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cases = build_cases(rng, args.games)
+
+    results = {}
+    print(f"{'benchmark':<32}{'median':>12}{'p10':>12}{'p90':>12}")
+    for name, fn, setup in cases:
+        if args.filter and args.filter not in name:
+            continue
+        samples = measure(fn, args.repeat, args.warmup, setup)
+        summary = results[name] = summarize(samples)
+        print(f"{name:<32}{summary['median_ms']:>10.3f}ms{summary['p10_ms']:>10.3f}ms{summary['p90_ms']:>10.3f}ms")
+
+    report = {
+        'version': RESULT_VERSION,
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__ if np is not None else None,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'warmup': args.warmup,
+            'games': args.games,
+        },
+        'results': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n已寫入 {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
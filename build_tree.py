@@ -0,0 +1,29 @@
+import argparse
+import time
+from core.helper import WordleHelper
+from core.solver import STRATEGIES, build_strategy_tree, tree_path
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the offline strategy tree used by --algo tree')
+    parser.add_argument('--strategy', choices=STRATEGIES + ('all',), default='all', help='Strategy to build (default: all)')
+    parser.add_argument('--beam', type=int, default=8, help='Guesses tried per node, ranked by entropy (default: 8)')
+    parser.add_argument('--candidate_beam', type=int, default=3, help='Extra candidate-word guesses tried per node (default: 3)')
+    args = parser.parse_args()
+
+    words = WordleHelper.read_words()
+    past_answers = frozenset(WordleHelper.read_past_answers())
+    strategies = STRATEGIES if args.strategy == 'all' else (args.strategy,)
+
+    for strategy in strategies:
+        print(f"Building '{strategy}' tree (beam={args.beam})...")
+        start_time = time.time()
+        tree = build_strategy_tree(words, past_answers, strategy, beam=args.beam, candidate_beam=args.candidate_beam)
+        path = tree_path(strategy)
+        tree.save(path)
+        meta = tree.meta
+        print(f"  -> 答案數: {meta['answers']}, 平均猜測: {meta['average_guesses']:.4f}")
+        print(f"  -> 搜尋節點: {meta['nodes']}, 耗時: {time.time() - start_time:.2f} 秒")
+        print(f"  -> 已寫入 {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import time
+from core import config
+from core.vocab import parse_words, parse_past_answers, vocabulary_store
+from core.wordfile import WordFile, compact, read_word_file, write_word_file
+
+
+def to_binary():
+    start_time = time.time()
+    words = parse_words(config.VOCAB_PATH)
+    write_word_file(config.VOCAB_BIN_PATH, words)
+    print(f"  -> 詞彙表: {len(words)} 字，已寫入 {config.VOCAB_BIN_PATH}")
+
+    # 歷史答案只會增加：保留二進位檔中已追加、但還沒匯出回 CSV 的字
+    answers = parse_past_answers(config.PAST_ANSWERS_PATH)
+    if os.path.exists(config.PAST_ANSWERS_BIN_PATH):
+        answers |= set(read_word_file(config.PAST_ANSWERS_BIN_PATH))
+    write_word_file(config.PAST_ANSWERS_BIN_PATH, answers, sort=True)
+    print(f"  -> 歷史答案: {len(answers)} 字，已寫入 {config.PAST_ANSWERS_BIN_PATH}")
+    print(f"  -> 耗時: {time.time() - start_time:.2f} 秒")
+
+
+def to_csv():
+    # 與原本 CSV 的格式相同：詞彙表 ", " 分隔 (保留順序，結尾也有分隔符)，歷史答案 "," 分隔並排序
+    words = read_word_file(config.VOCAB_BIN_PATH)
+    with open(config.VOCAB_PATH, 'w', encoding='utf-8') as f:
+        f.write("".join(f"{w}, " for w in words))
+    print(f"  -> 詞彙表: {len(words)} 字，已寫入 {config.VOCAB_PATH}")
+
+    answers = sorted(set(read_word_file(config.PAST_ANSWERS_BIN_PATH)))
+    with open(config.PAST_ANSWERS_PATH, 'w', encoding='utf-8') as f:
+        f.write(",".join(answers))
+    print(f"  -> 歷史答案: {len(answers)} 字，已寫入 {config.PAST_ANSWERS_PATH}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert the vocabulary / answer history between CSV and the binary word-file format')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--export', action='store_true', help='Write the binary files back to CSV')
+    group.add_argument('--compact', action='store_true', help='Merge appended answers into the sorted answer file')
+    args = parser.parse_args()
+
+    if args.export:
+        to_csv()
+    elif args.compact:
+        with WordFile(config.PAST_ANSWERS_BIN_PATH) as wf:
+            appended = wf.appended
+        compact(config.PAST_ANSWERS_BIN_PATH)
+        print(f"  -> 已併入 {appended} 個追加的答案: {config.PAST_ANSWERS_BIN_PATH}")
+    else:
+        to_binary()
+    vocabulary_store.invalidate()
+
+if __name__ == "__main__":
+    main()
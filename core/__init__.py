@@ -1,2 +1,2 @@
-from .helper import WordleHelper, FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE
+from .helper import WordleHelper, FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE, FREQ_ENTROPY, FREQ_TREE, FREQ_LOOKAHEAD
 from .config import DATA_DIR, VOCAB_PATH, PAST_ANSWERS_PATH
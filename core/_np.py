@@ -0,0 +1,5 @@
+# NumPy 為選用相依套件：集中在這裡匯入，沒有安裝時 np = None，各模組改走純 Python 版本
+try:
+    import numpy as np
+except ImportError:
+    np = None
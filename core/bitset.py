@@ -0,0 +1,110 @@
+import base64
+from . import config
+from .cache import ScoreCache, VocabularyMemo, candidate_fingerprint
+from ._np import np
+
+
+def bit_count(bits):
+    # int.bit_count 需要 Python 3.10
+    return bin(bits).count('1')
+
+
+def encode_bitset(bits):
+    """bitset -> 短字串 (little-endian bytes 的 urlsafe base64)，可直接放進 JSON / Flask session"""
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_bitset(text):
+    return int.from_bytes(base64.urlsafe_b64decode(text.encode('ascii')), 'little')
+
+
+class BitsetIndex:
+    """
+    詞彙表上的固定寬度 bitset：第 i 個 bit = words[i] 是否在集合內 (Python 大整數)。
+    - 候選字集合的交集 / 差集都是一次整數運算 (Hybrid 排除歷史 = 一次 AND-NOT)
+    - consistent(guess, code): 與 (guess, pattern) 一致的答案集合，由 pattern 矩陣產生並以 LRU 快取，
+      過濾 = 與這個 bitset 取交集，不需重新掃描候選字
+    """
+
+    def __init__(self, words, cache_size=None):
+        self.words = tuple(words)
+        self.size = len(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.full = (1 << self.size) - 1
+        self.fingerprint = candidate_fingerprint(self.words)
+        self._consistent = ScoreCache(cache_size if cache_size is not None else config.CONSISTENT_SET_CACHE_SIZE)
+        self._subset = None
+
+    def from_words(self, words):
+        """單字 -> bitset；只要有任何單字不在詞彙表內就回傳 None"""
+        index = self.index
+        bits = 0
+        try:
+            for word in words:
+                bits |= 1 << index[word]
+        except KeyError:
+            return None
+        return bits
+
+    def subset(self, words):
+        """固定集合 (例如歷史答案) 的 bitset，不在詞彙表內的字忽略；同一個集合物件只計算一次"""
+        entry = self._subset
+        if entry is None or entry[0] is not words:
+            index = self.index
+            bits = 0
+            for word in words:
+                if word in index:
+                    bits |= 1 << index[word]
+            entry = self._subset = (words, bits)
+        return entry[1]
+
+    def to_words(self, bits):
+        """bitset -> 單字 list (依詞彙表順序)"""
+        words = self.words
+        flags = bin(bits)[:1:-1]  # 反轉後第 i 個字元 = 第 i 個 bit
+        result = []
+        i = flags.find('1')
+        while i >= 0:
+            result.append(words[i])
+            i = flags.find('1', i + 1)
+        return result
+
+    def to_indices(self, bits):
+        """bitset -> 遞增的列號陣列 (NumPy，給 WordTable 向量運算)"""
+        raw = np.frombuffer(bits.to_bytes((self.size + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder='little')[:self.size])
+
+    def from_indices(self, indices):
+        flags = np.zeros(self.size, dtype=bool)
+        flags[indices] = True
+        return int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+
+    def consistent(self, matrix, guess, code):
+        """
+        與 (guess, pattern code) 一致的答案 bitset。
+        matrix 必須與本 index 使用同一份詞彙表；guess 不在矩陣內時回傳 None。
+        """
+        if guess not in matrix:
+            return None
+        key = (guess, code)
+        bits = self._consistent.get(key)
+        if bits is not None:
+            return bits
+        array = matrix.as_array()
+        if array is not None:
+            flags = array[matrix.index[guess]] == code
+            bits = int.from_bytes(np.packbits(flags, bitorder='little').tobytes(), 'little')
+        else:
+            # 純 Python：把該列的 pattern code 轉成 '0' / '1' 字串，反轉後以二進位解析
+            table = bytes(0x31 if c == code else 0x30 for c in range(256))
+            bits = int(bytes(matrix.row(guess)).translate(table)[::-1], 2)
+        self._consistent.put(key, bits)
+        return bits
+
+
+_indexes = VocabularyMemo(BitsetIndex)
+
+
+def get_bitset_index(words):
+    return _indexes.get(words)
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from . import config
+
+
+def candidate_fingerprint(words):
+    """候選字集合 (含順序) 的穩定雜湊，跨 process 一致"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\n".join(words).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LRUDict:
+    """
+    Thread-safe 的 LRU dict：超過 max_entries 筆時淘汰最久沒用的項目 (max_entries <= 0 代表停用)。
+    get 命中時更新使用順序；`in` 只檢查是否存在，不更新順序。
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict(self.max_entries)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def oldest(self):
+        """最久沒用的 (key, value)；空的時候回傳 None"""
+        with self._lock:
+            return next(iter(self._data.items()), None)
+
+    def _evict(self, limit):
+        while len(self._data) > max(limit, 0):
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, max_entries):
+        with self._lock:
+            self.max_entries = max_entries
+            self._evict(max_entries)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ScoreCache(LRUDict):
+    """
+    以 LRU 淘汰的評分快取 (key -> [(word, score)])，另外統計命中率。
+    max_entries 控制記憶體上限：每筆完整 Entropy 排名約 2300 組 (word, score)，
+    約 0.2 MB。
+    """
+
+    def __init__(self, max_entries=None):
+        super().__init__(max_entries if max_entries is not None else config.SCORE_CACHE_SIZE)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        value = super().get(key)
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def clear(self):
+        super().clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+class VocabularyMemo:
+    """詞彙表 -> factory(詞彙表 tuple) 建出的物件；每個詞彙表只建一次，process 內共用"""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._values = {}
+
+    def get(self, words):
+        key = tuple(words)
+        if key not in self._values:
+            self._values[key] = self._factory(key)
+        return self._values[key]
+
+
+# 單一 process 共用的 Entropy 評分快取
+score_cache = ScoreCache()
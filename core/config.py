@@ -10,4 +10,39 @@ DATA_DIR = BASE_DIR / 'data'
 VOCAB_PATH = DATA_DIR / 'vocabularies.csv'
 # 預留給之後的歷史檔案
 PAST_ANSWERS_PATH = DATA_DIR / 'answers.csv' 
+# 二進位單字檔 (convert_data.py 由上面的 CSV 產生；存在時優先讀取，core.wordfile)
+VOCAB_BIN_PATH = DATA_DIR / 'vocabularies.bin'
+PAST_ANSWERS_BIN_PATH = DATA_DIR / 'answers.bin'
+# 二進位答案檔的追加區累積到這麼多字時重新壓實 (排序並重建索引)
+ANSWERS_COMPACT_THRESHOLD = 64
 STRATEGY_RESULTS_PATH = DATA_DIR / 'strategy_results.csv'
+# 預先計算的 guess×secret 回饋矩陣快取 (自動產生)
+PATTERN_MATRIX_PATH = DATA_DIR / 'pattern_matrix.bin'
+
+# Entropy 模式的候選字數上限：超過時改用 Unique Frequency 評分。
+# None 代表不限制 (查表計算整個詞彙表也在 1 秒內)
+ENTROPY_MAX_CANDIDATES = None
+
+# 開局書 (第一猜與每種回饋的第二猜，自動產生)
+OPENING_BOOK_PATH = DATA_DIR / 'opening_book.json'
+# 開局書中每個狀態保留的排名數
+OPENING_BOOK_DEPTH = 20
+
+# Entropy 評分快取 (LRU) 的最大筆數；每筆約 0.2 MB，0 代表停用
+SCORE_CACHE_SIZE = 128
+
+# 每回合預設只排出前幾名 (get_top_guesses 要求更多時才計算完整排名)
+SCORE_TOP_K = 20
+
+# 漸進式 Entropy 排名 (iter_top_guesses) 每批計算的猜測字數
+PROGRESSIVE_CHUNK_SIZE = 256
+
+# Lookahead 模式每回合的時間預算 (秒) 與節點預算 (None = 不限制)
+LOOKAHEAD_TIME_BUDGET = 0.2
+LOOKAHEAD_NODE_BUDGET = None
+
+# 「與 (guess, pattern) 一致的答案」bitset 快取 (LRU) 的最大筆數；每筆約 N/8 bytes
+CONSISTENT_SET_CACHE_SIZE = 4096
+
+# 回合耗時超過此值 (毫秒) 時記為慢回合 (core.metrics)
+METRICS_SLOW_TURN_MS = 200
@@ -0,0 +1,81 @@
+from .patterns import feedback_to_code
+
+ALL_LETTERS = (1 << 26) - 1
+
+
+def letter_bit(char):
+    return 1 << (ord(char) - 65)
+
+
+class Constraint:
+    """
+    把一組 (guess, feedback) 編譯成可重複使用的條件：
+    - position_masks: 每個位置允許的字母 (26-bit mask)
+    - min_counts / max_counts: 每個字母至少 / 至多出現幾次
+
+    重複字母依 Wordle 規則處理：同一字母的 G+Y 數量為下限，
+    只要該字母出現過 X，下限同時也是上限。
+    """
+
+    __slots__ = ('guess', 'feedback', 'position_masks', 'min_counts', 'max_counts')
+
+    def __init__(self, guess, feedback):
+        self.guess = guess = guess.upper()
+        self.feedback = feedback = feedback.upper()
+        masks = [ALL_LETTERS] * 5
+        hits = {}
+        grayed = set()
+
+        for i in range(5):
+            char, mark = guess[i], feedback[i]
+            if mark == 'G':
+                masks[i] = letter_bit(char)
+                hits[char] = hits.get(char, 0) + 1
+            else:
+                masks[i] &= ~letter_bit(char)
+                if mark == 'Y':
+                    hits[char] = hits.get(char, 0) + 1
+                else:
+                    grayed.add(char)
+
+        self.min_counts = hits
+        self.max_counts = {char: hits.get(char, 0) for char in grayed}
+
+        # 完全不存在的字母，直接從所有非 Green 位置移除
+        absent = 0
+        for char, limit in self.max_counts.items():
+            if limit == 0:
+                absent |= letter_bit(char)
+        self.position_masks = tuple(m if m & (m - 1) == 0 else m & ~absent for m in masks)
+
+    def matches(self, word):
+        masks = self.position_masks
+        for i in range(5):
+            if not masks[i] >> (ord(word[i]) - 65) & 1:
+                return False
+        for char, limit in self.min_counts.items():
+            if word.count(char) < limit:
+                return False
+        for char, limit in self.max_counts.items():
+            if word.count(char) > limit:
+                return False
+        return True
+
+    def filter(self, words):
+        matches = self.matches
+        return [word for word in (w.upper() for w in words) if matches(word)]
+
+
+def filter_candidates(words, guess, feedback, matrix=None):
+    """
+    回傳 words 中與 (guess, feedback) 一致的單字。
+    有 pattern 矩陣且所有單字都在矩陣內時直接查表，否則使用編譯後的 Constraint。
+    """
+    guess = guess.upper()
+    if matrix is not None and guess in matrix:
+        indices = matrix.indices(words)
+        if indices is not None:
+            code = feedback_to_code(feedback)
+            row = matrix.row(guess)
+            return [word for word, i in zip(words, indices) if row[i] == code]
+    return Constraint(guess, feedback).filter(words)
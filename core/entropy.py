@@ -0,0 +1,141 @@
+import math
+from collections import Counter
+from operator import itemgetter
+from ._np import np
+from .patterns import NUM_PATTERNS
+
+# 猜測字本身就是候選答案時的加分 (Entropy 差不多時優先選可能直接猜中的詞)
+CANDIDATE_BONUS = 0.0001
+
+
+def pattern_entropies(codes):
+    """
+    批次計算 Entropy。
+    codes: 2-D pattern codes，每一列是某個 guess 對所有候選答案的 pattern (0-242)。
+    回傳每一列的 Entropy (bits)。NumPy 陣列走向量化版本，其餘走純 Python。
+    """
+    if np is not None and isinstance(codes, np.ndarray):
+        return _pattern_entropies_numpy(codes)
+    return [_row_entropy(row) for row in codes]
+
+
+def histograms_numpy(codes):
+    """codes (guess × secret 的 pattern codes) -> 每個 guess 的 243 格 histogram (NumPy)"""
+    num_guesses = codes.shape[0]
+    # 每列加上 row * 243 的位移，一次 bincount 就得到所有 guess 的 histogram
+    offsets = np.arange(num_guesses, dtype=np.int64)[:, None] * NUM_PATTERNS
+    hist = np.bincount((codes + offsets).ravel(), minlength=num_guesses * NUM_PATTERNS)
+    return hist.reshape(num_guesses, NUM_PATTERNS)
+
+
+def _entropies_from_hist(hist, total):
+    p = hist / total
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(hist > 0, p * np.log2(p), 0.0)
+    return -terms.sum(axis=1)
+
+
+def _pattern_entropies_numpy(codes):
+    num_guesses, total = codes.shape
+    if total == 0:
+        return np.zeros(num_guesses)
+    return _entropies_from_hist(histograms_numpy(codes), total)
+
+
+def _row_entropy(row):
+    total = len(row)
+    entropy = 0.0
+    for count in Counter(row).values():
+        p = count / total
+        entropy -= p * math.log2(p)
+    return entropy
+
+
+def _row_stats(row):
+    """(Entropy, 期望剩餘候選字數 = sum(|class|^2) / total)，同一次計數算出"""
+    total = len(row)
+    entropy = 0.0
+    squares = 0
+    for count in Counter(row).values():
+        p = count / total
+        entropy -= p * math.log2(p)
+        squares += count * count
+    return entropy, squares / total
+
+
+def _selected_rows(matrix, guess_pool, secret_idx):
+    # 候選字等於整個詞彙表時 (開局)，整列直接計數即可
+    if len(secret_idx) == matrix.size:
+        return (matrix.row(guess) for guess in guess_pool)
+    if len(secret_idx) == 1:
+        return ((matrix.row(guess)[secret_idx[0]],) for guess in guess_pool)
+    select = itemgetter(*secret_idx)
+    return (select(matrix.row(guess)) for guess in guess_pool)
+
+
+def entropy_scores(matrix, guess_pool, candidates):
+    """
+    以 pattern 矩陣計算 guess_pool 中每個字對 candidates 的 Entropy。
+    回傳 [(word, score)] (未排序，與 guess_pool 同順序)，格式與 WordleHelper.word_scores 相同。
+    若有單字不在矩陣內則回傳 None，由呼叫端退回逐字比對。
+    """
+    secret_idx = matrix.indices(candidates)
+    guess_idx = matrix.indices(guess_pool)
+    if secret_idx is None or guess_idx is None:
+        return None
+    if not guess_idx or not secret_idx:
+        return [(guess, 0.0) for guess in guess_pool]
+
+    array = matrix.as_array() if np is not None else None
+    if array is not None:
+        return _entropy_scores_numpy(array, guess_pool, guess_idx, secret_idx)
+
+    candidate_set = set(candidates)
+    rows = _selected_rows(matrix, guess_pool, secret_idx)
+    scores = []
+    for guess, entropy in zip(guess_pool, pattern_entropies(rows)):
+        bonus = CANDIDATE_BONUS if guess in candidate_set else 0
+        scores.append((guess, entropy + bonus))
+    return scores
+
+
+def _entropy_scores_numpy(array, guess_pool, guess_idx, secret_idx):
+    guess_idx = np.asarray(guess_idx, dtype=np.intp)
+    secret_idx = np.asarray(secret_idx, dtype=np.intp)
+    codes = array[np.ix_(guess_idx, secret_idx)]
+    entropies = _pattern_entropies_numpy(codes)
+    entropies += CANDIDATE_BONUS * np.isin(guess_idx, secret_idx)
+    return list(zip(guess_pool, entropies.tolist()))
+
+
+def partition_stats(matrix, guess_pool, candidates):
+    """
+    與 entropy_scores 相同，但每個字另外回傳猜完之後的期望剩餘候選字數：
+    [(word, entropy + bonus, expected_size)] (與 guess_pool 同順序)。
+    兩者來自同一個 histogram，不需要額外一次掃描。單字不在矩陣內時回傳 None。
+    """
+    secret_idx = matrix.indices(candidates)
+    guess_idx = matrix.indices(guess_pool)
+    if secret_idx is None or guess_idx is None:
+        return None
+    total = len(secret_idx)
+    if not guess_idx or not total:
+        return [(guess, 0.0, float(total)) for guess in guess_pool]
+
+    array = matrix.as_array() if np is not None else None
+    if array is not None:
+        guess_idx = np.asarray(guess_idx, dtype=np.intp)
+        secret_idx = np.asarray(secret_idx, dtype=np.intp)
+        hist = histograms_numpy(array[np.ix_(guess_idx, secret_idx)])
+        entropies = _entropies_from_hist(hist, total)
+        entropies += CANDIDATE_BONUS * np.isin(guess_idx, secret_idx)
+        sizes = (hist.astype(np.int64) ** 2).sum(axis=1) / total
+        return list(zip(guess_pool, entropies.tolist(), sizes.tolist()))
+
+    candidate_set = set(candidates)
+    stats = []
+    for guess, row in zip(guess_pool, _selected_rows(matrix, guess_pool, secret_idx)):
+        entropy, size = _row_stats(row)
+        bonus = CANDIDATE_BONUS if guess in candidate_set else 0
+        stats.append((guess, entropy + bonus, size))
+    return stats
@@ -0,0 +1,25 @@
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_write(path, mode='w'):
+    """
+    寫入 path 的 context manager：先寫到同目錄的暫存檔，成功後以 os.replace 原子性替換，
+    其他 process 不會讀到寫到一半的檔案。寫入失敗時刪除暫存檔，不留下 .tmp
+    (文字模式一律 UTF-8)
+    """
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    encoding = None if 'b' in mode else 'utf-8'
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
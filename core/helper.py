@@ -1,93 +1,317 @@
-import csv
+import copy
+import heapq
 import math
+import os
+import threading
+import time
 from collections import Counter
+from contextlib import contextmanager
+from operator import itemgetter
 from . import config
+from .patterns import get_pattern_matrix, feedback_to_code
+from .entropy import entropy_scores, CANDIDATE_BONUS
+from .constraints import filter_candidates
+from .vocab import vocabulary_store
+from .wordfile import WordFile, append_word, pack_words
+from .opening_book import get_opening_book
+from .cache import score_cache, candidate_fingerprint
+from .solver import get_strategy_tree
+from .lookahead import lookahead_scores
+from .word_table import get_word_table
+from .bitset import get_bitset_index, bit_count, encode_bitset, decode_bitset
+from .metrics import TurnRecord
 
 # Frequency count criteria constants
 FREQ_TOTAL = 'total'
 FREQ_REPEAT = 'repeat'
 FREQ_UNIQUE = 'unique'
 FREQ_ENTROPY = 'entropy'  # 新增演算法常數
+FREQ_TREE = 'tree'  # 離線策略樹 (build_tree.py)；走出樹外時改用 Entropy
+FREQ_LOOKAHEAD = 'lookahead'  # 兩步前瞻 (有時間預算)
+
+# 進行中的 TurnRecord，依 thread 分開保存 (id(helper) -> record)
+_turn_records = threading.local()
+
+# 以字母頻率評分的模式 (char_count 只記錄單一字母，三者分數相同)
+FREQUENCY_MODES = (FREQ_TOTAL, FREQ_REPEAT, FREQ_UNIQUE)
+
+def rank_scores(word_scores, top_k=None):
+    """
+    依分數由高到低排序。指定 top_k 時只用 heap 取前 k 名
+    (與完整排序後切片的結果完全相同，含同分時的順序)。
+    """
+    if top_k is None or top_k >= len(word_scores):
+        word_scores.sort(key=itemgetter(1), reverse=True)
+        return word_scores
+    return heapq.nlargest(top_k, word_scores, key=itemgetter(1))
+
+# 每個單字不重複的小寫字母，增量更新頻率時反覆使用
+_letter_cache = {}
+
+def _unique_letters(word):
+    """單字中不重複的小寫字母 (process 共用快取)"""
+    letters = _letter_cache.get(word)
+    if letters is None:
+        letters = _letter_cache[word] = ''.join(set(word.lower()))
+    return letters
 
 class WordleHelper:
-    def __init__(self, words=None, mode=FREQ_UNIQUE, exclude_history=False, hybrid_mode=False):
-        # 1. 讀取基礎詞彙表
-        self.all_words = self.read_words()
+    def __init__(self, words=None, mode=FREQ_UNIQUE, exclude_history=False, hybrid_mode=False, entropy_max_candidates=None, opening_book=True, lookahead_budget=None, on_turn=None, past_answers=None, verbose=True):
+        # 1. 讀取基礎詞彙表 (process 共用的唯讀 tuple，只在檔案變動時重新解析)
+        self.all_words = self._load_all_words()
+        # 候選字以詞彙表上的 bitset 保存 (過濾 / 排除都是整數運算)，self.words 需要時才轉成 list；
+        # 有 NumPy 時另外轉成 WordTable 列號陣列做向量化頻率統計
+        self.table = get_word_table(self.all_words)
+        self.bitsets = get_bitset_index(self.all_words)
+        self._indices = None
+        self._letter_counts = None
+        # 增量維護的字母頻率：char_count 對應的候選字 list 與每個字的 Frequency 分數
+        self.char_count = Counter()
+        self._freq_words = None
+        self._freq_scores = None
         
         if words is None:
-            self.words = self.all_words.copy()
+            self._words = None if self.table is not None else list(self.all_words)
+            self._bits = self.bitsets.full
         else:
             self.words = words
             
         self.mode = mode
         self.hybrid_mode = hybrid_mode
         self.history_excluded = False
+        # Entropy 候選字數上限 (None = 使用 config 設定)
+        self.entropy_max_candidates = entropy_max_candidates if entropy_max_candidates is not None else config.ENTROPY_MAX_CANDIDATES
+        # Lookahead 每回合的時間預算 (秒，None = 使用 config 設定)
+        self.lookahead_budget = lookahead_budget if lookahead_budget is not None else config.LOOKAHEAD_TIME_BUDGET
+        # Entropy 模式啟動時就 mmap 載入 pattern 矩陣，其他模式延遲到需要時才載入
+        self.patterns = get_pattern_matrix(self.all_words) if mode in (FREQ_ENTROPY, FREQ_TREE, FREQ_LOOKAHEAD) else None
+        # 策略樹依策略分開建立
+        if hybrid_mode:
+            self.strategy = 'hybrid'
+        elif exclude_history:
+            self.strategy = 'exclude'
+        else:
+            self.strategy = 'standard'
+
+        # 已猜過的 (guess, feedback)，用來查開局書
+        self.guess_history = []
+        # 開局書只適用於預設詞彙表與預設的 Entropy 設定
+        self.use_opening_book = (
+            opening_book
+            and words is None
+            and self.entropy_max_candidates is None
+            and mode in (FREQ_ENTROPY, FREQ_UNIQUE)
+        )
+        # 策略樹同樣依預設詞彙表與歷史答案檔建立
+        self.use_strategy_tree = mode == FREQ_TREE and words is None
+        # word_scores 是否為完整排名 (開局書只存前幾名)
+        self._scores_complete = True
+        # 量測 callback：每回合結束時以 TurnRecord 呼叫 (例如 core.metrics.metrics)；None = 不量測
+        self.on_turn = on_turn
+
+        with self._turn_scope('init'):
+            # 2. 純 Wordle 模式初始化排除
+            # past_answers: 要排除的集合 (None = 讀取歷史答案檔)；verbose=False 時不印模式訊息 (批次模擬用)
+            if exclude_history and not hybrid_mode:
+                self.exclude_past_answers(past_answers, verbose=verbose)
+                if verbose:
+                    print(f"[Mode] Pure Wordle Mode: Past answers excluded from start.")
+            elif hybrid_mode and verbose:
+                print(f"[Mode] Hybrid Mode: Past answers will be excluded after the 1st guess.")
+
+            # 3. 初始化分數 (排除歷史時已在 exclude_past_answers 中計算)
+            if not self.history_excluded:
+                self._rescore()
+
+    def clone(self):
+        """複製目前的遊戲狀態 (共用唯讀資料，只複製會被修改的 list)"""
+        other = copy.copy(self)
+        # bitset 與列號陣列不會被原地修改，可以直接共用
+        if self._words is not None:
+            other._words = list(self._words)
+        other.guess_history = list(self.guess_history)
+        # 增量維護的頻率狀態會被原地修改，也要各自一份
+        other.char_count = Counter(self.char_count)
+        other._freq_scores = dict(self._freq_scores) if self._freq_scores is not None else None
+        other._freq_words = other._words if self._freq_words is not None and self._freq_words is self._words else None
+        return other
+
+    # --- 量測 ---
+
+    @property
+    def _turn(self):
+        """目前 thread 在這個 helper 上進行中的 TurnRecord (網頁服務中同一個 helper 可能同時被多個請求使用)"""
+        records = getattr(_turn_records, 'records', None)
+        return records.get(id(self)) if records else None
+
+    @contextmanager
+    def _turn_scope(self, event):
+        """一個回合的量測範圍 (巢狀時併入外層回合)；結束時呼叫 on_turn"""
+        if self.on_turn is None or self._turn is not None:
+            yield
+            return
+        records = getattr(_turn_records, 'records', None)
+        if records is None:
+            records = _turn_records.records = {}
+        record = records[id(self)] = TurnRecord(event, self.mode, len(self.guess_history), self._candidate_count())
+        try:
+            yield
+        finally:
+            del records[id(self)]
+            record.finish(self._candidate_count())
+            self.on_turn(record)
+
+    @contextmanager
+    def _phase(self, name):
+        record = self._turn
+        if record is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record.add(name, time.perf_counter() - start)
+
+    @property
+    def words(self):
+        """目前的候選字 list (以 bitset 保存時第一次存取才轉換，之後快取)"""
+        if self._words is None:
+            self._words = self.bitsets.to_words(self._bits)
+        return self._words
+
+    @words.setter
+    def words(self, words):
+        # 有單字不在詞彙表內 (自訂 words) 時 _bits = None，改用 list 過濾
+        self._words = words
+        self._bits = self.bitsets.from_words(words)
+        self._indices = None
+
+    def _set_bits(self, bits):
+        if self.table is None:
+            # 沒有 NumPy：頻率沿用 list 的增量更新
+            self._set_words(self.bitsets.to_words(bits))
+        else:
+            self._words = None
+        self._bits = bits
+        self._indices = None
+
+    def _vectorized(self):
+        return self.table is not None and self._bits is not None
 
-        # 2. 純 Wordle 模式初始化排除
-        if exclude_history and not hybrid_mode:
-            self.exclude_past_answers()
-            print(f"[Mode] Pure Wordle Mode: Past answers excluded from start.")
-        elif hybrid_mode:
-            print(f"[Mode] Hybrid Mode: Past answers will be excluded after the 1st guess.")
+    def _candidate_indices(self):
+        if self._indices is None:
+            self._indices = self.bitsets.to_indices(self._bits)
+        return self._indices
 
-        # 3. 初始化分數
-        self.char_count = self.analyze_freq()
-        self.word_scores = self.score(self.mode, self.words, self.char_count)
+    def export_state(self):
+        """
+        目前遊戲狀態的 JSON 相容表示 (候選字 bitset 只有幾百 bytes)，可直接存進 Flask session；
+        以 restore_state 還原到相同詞彙表與設定的 helper 上。
+        """
+        state = {
+            'vocab': self.bitsets.fingerprint,
+            'history': [list(step) for step in self.guess_history],
+            'excluded': self.history_excluded,
+        }
+        if self._bits is not None:
+            state['candidates'] = encode_bitset(self._bits)
+        else:
+            state['words'] = list(self.words)
+        return state
+
+    def restore_state(self, state, deferred=False):
+        """還原 export_state 的結果；詞彙表已變動時丟出 ValueError (deferred: 同 filter_words)"""
+        if state.get('vocab') != self.bitsets.fingerprint:
+            raise ValueError("Saved state does not match the current vocabulary")
+        self._freq_words = None  # 不是目前候選字的子集合，頻率重新計數
+        if 'candidates' in state:
+            self._set_bits(decode_bitset(state['candidates']) & self.bitsets.full)
+        else:
+            self.words = list(state['words'])
+        self.guess_history = [tuple(step) for step in state.get('history', [])]
+        self.history_excluded = bool(state.get('excluded', False))
+        self._rescore(deferred)
+        return self
 
-    def exclude_past_answers(self):
+    def exclude_past_answers(self, past_answers=None, verbose=True, deferred=False):
+        """
+        從候選字中排除歷史答案 (bitset 時為一次 AND-NOT)。
+        past_answers: 指定要排除的集合 (None = 讀取歷史答案檔)；verbose=False 時不印訊息 (批次模擬用)
+        deferred: 同 filter_words
+        """
         if self.history_excluded:
             return
 
-        past_answers = self.read_past_answers()
+        stored_answers = self._load_past_answers()
+        if past_answers is None:
+            past_answers = stored_answers
+        elif past_answers != stored_answers:
+            # 開局書與策略樹依歷史答案檔建立，排除其他集合時不能再查
+            self.use_opening_book = False
+            self.use_strategy_tree = False
         if not past_answers:
             return
 
-        original_count = len(self.words)
-        self.words = [w for w in self.words if w not in past_answers]
-        self.history_excluded = True
-        
-        # 重新計算
-        self.char_count = self.analyze_freq()
-        self.word_scores = self.score(self.mode, self.words, self.char_count)
+        with self._turn_scope('exclude'):
+            original_count = self._candidate_count()
+            with self._phase('filter'):
+                if self._bits is not None:
+                    self._set_bits(self._bits & ~self.bitsets.subset(past_answers))
+                else:
+                    self._set_words([w for w in self.words if w not in past_answers])
+            self.history_excluded = True
+            
+            # 重新計算
+            self._rescore(deferred)
 
-        print(f"\n[Strategy Update] Loaded {len(past_answers)} past answers.")
-        print(f"[Strategy Update] Vocabulary reduced from {original_count} to {len(self.words)} words.")
+        if verbose:
+            print(f"\n[Strategy Update] Loaded {len(past_answers)} past answers.")
+            print(f"[Strategy Update] Vocabulary reduced from {original_count} to {self._candidate_count()} words.")
+
+    def _candidate_count(self):
+        if self._words is None:
+            return bit_count(self._bits)
+        return len(self._words)
+
+    @staticmethod
+    def _load_all_words():
+        try:
+            return vocabulary_store.words()
+        except FileNotFoundError:
+            print(f"Error: Vocabulary file not found at {config.VOCAB_PATH}")
+            return ()
+
+    @staticmethod
+    def _load_past_answers():
+        try:
+            return vocabulary_store.past_answers()
+        except FileNotFoundError:
+            return frozenset()
+        except Exception as e:
+            print(f"Warning: Failed to read past answers: {e}")
+            return frozenset()
 
     @staticmethod
     def read_words(filename=None):
         target_path = filename if filename else config.VOCAB_PATH
         try:
-            with open(target_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                try:
-                    row = next(reader)
-                    words = [word.strip() for word in row if word.strip()]
-                except StopIteration:
-                    words = []
-            return words
+            return list(vocabulary_store.words(target_path))
         except FileNotFoundError:
             print(f"Error: Vocabulary file not found at {target_path}")
             return []
 
     @staticmethod
     def read_past_answers():
-        target_path = config.PAST_ANSWERS_PATH
-        past_answers = set()
-        if target_path.exists():
-            try:
-                with open(target_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if content:
-                        words = content.split(',')
-                        past_answers = {w.strip().upper() for w in words if w.strip()}
-            except Exception as e:
-                print(f"Warning: Failed to read past answers: {e}")
-        return past_answers
+        return set(WordleHelper._load_past_answers())
 
     def save_new_answer(self, new_answer):
         """將新答案存入歷史檔案 (並維持字母順序)"""
-        target_path = config.PAST_ANSWERS_PATH
+        target_path = vocabulary_store.answers_path()
         new_answer = new_answer.strip().upper()
+
+        if target_path == config.PAST_ANSWERS_BIN_PATH:
+            return self._append_answer(target_path, new_answer)
         
         # 1. 讀取現有答案 (複用現有邏輯)
         current_answers = self.read_past_answers() # 回傳的是 set
@@ -109,6 +333,7 @@ class WordleHelper:
             
             with open(target_path, 'w', encoding='utf-8') as f:
                 f.write(",".join(sorted_answers))
+            vocabulary_store.invalidate(target_path)
                 
             print(f"[History] Added '{new_answer}'. Total count: {len(sorted_answers)}")
             return True, f"已成功將 '{new_answer}' 加入歷史記錄。\n目前總數: {len(sorted_answers)}"
@@ -116,11 +341,109 @@ class WordleHelper:
             print(f"[History] Save error: {e}")
             return False, f"存檔失敗: {e}"
 
+    @staticmethod
+    def _append_answer(target_path, new_answer):
+        """
+        二進位答案檔：只在檔尾追加 5 bytes，追加區累積到一定數量才重新排序壓實。
+        版本控制中的 CSV 同步更新 (平常在結尾追加，壓實時重新排序)；
+        先寫 CSV 再寫二進位檔，二進位檔才不會比 CSV 舊而被當成過期
+        """
+        csv_path = config.PAST_ANSWERS_PATH
+        try:
+            pack_words([new_answer])  # 先檢查格式，兩個檔案都還沒寫入
+            with WordFile(target_path) as wf:
+                if new_answer in wf:
+                    print(f"[History] '{new_answer}' already exists in history.")
+                    return False, f"'{new_answer}' 已經在歷史記錄中了。"
+                compacting = wf.appended + 1 >= config.ANSWERS_COMPACT_THRESHOLD
+                total = len(wf) + 1
+                # 只有壓實 (重寫排序後的 CSV) 時才需要解碼全部的字
+                answers = wf.words() if compacting else None
+            if compacting:
+                with open(csv_path, 'w', encoding='utf-8') as f:
+                    f.write(",".join(sorted(set(answers) | {new_answer})))
+            else:
+                has_content = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+                with open(csv_path, 'a', encoding='utf-8') as f:
+                    f.write(f",{new_answer}" if has_content else new_answer)
+            append_word(target_path, new_answer, config.ANSWERS_COMPACT_THRESHOLD)
+            vocabulary_store.invalidate(target_path)
+            vocabulary_store.invalidate(csv_path)
+        except Exception as e:
+            print(f"[History] Save error: {e}")
+            return False, f"存檔失敗: {e}"
+        print(f"[History] Added '{new_answer}'. Total count: {total}")
+        return True, f"已成功將 '{new_answer}' 加入歷史記錄。\n目前總數: {total}"
+
     # --- 分析邏輯 ---
     def analyze_freq(self):
         # Entropy 模式不需要依賴這裡的 char_count，但為了相容性保留計算
         return self._analyze_unique_char_freq(self.words)
 
+    def _set_words(self, new_words):
+        """
+        換成新的候選字 list (舊 list 的子集合，順序不變)，並增量更新 char_count：
+        減掉被移除單字的字母貢獻，只重算含有變動字母的單字分數。
+        移除的字比留下的多時，直接對留下的字重新計數比較快。
+        """
+        old_words = self.words
+        self._words = new_words
+        if self._freq_words is not old_words:
+            # 狀態不是由這個 list 算出來的 (例如外部直接改了 self.words)
+            return
+        removed_count = len(old_words) - len(new_words)
+        if removed_count == 0:
+            self._freq_words = new_words
+            return
+        if removed_count > len(new_words):
+            self._freq_words = None  # 交給 _refresh_freq 重新計數
+            return
+
+        kept = set(new_words)
+        removed = [w for w in old_words if w not in kept]
+
+        letters = _unique_letters
+        delta = Counter()
+        for word in removed:
+            delta.update(letters(word))
+        char_count = self.char_count
+        char_count.subtract(delta)
+        for c in delta:
+            if char_count[c] <= 0:
+                del char_count[c]
+
+        scores = self._freq_scores
+        if scores is not None:
+            for word in removed:
+                del scores[word]
+            for word in new_words:
+                changed = [delta[c] for c in letters(word) if c in delta]
+                if changed:
+                    scores[word] -= sum(changed)
+        self._freq_words = new_words
+
+    def _refresh_freq(self):
+        """確保 char_count (以及 Frequency 模式的每字分數) 對應目前的 self.words"""
+        if self._vectorized():
+            # 列號陣列：整批向量化重新計數即可
+            self.char_count = self.table.to_counter(self._table_letter_counts())
+            return
+        if self._freq_words is not self.words:
+            self.char_count = self.analyze_freq()
+            self._freq_scores = None
+            self._freq_words = self.words
+        if self._freq_scores is None and self.mode in FREQUENCY_MODES:
+            char_count = self.char_count
+            self._freq_scores = {word: sum(char_count[c] for c in _unique_letters(word)) for word in self.words}
+
+    def _table_letter_counts(self):
+        # 依列號陣列快取 (self.words 被外部換掉時會自動重算)
+        indices = self._candidate_indices()
+        cached = self._letter_counts
+        if cached is None or cached[0] is not indices:
+            cached = self._letter_counts = (indices, self.table.letter_counts(indices))
+        return cached[1]
+
     @staticmethod
     def _analyze_total_char_freq(words):
         char_count = Counter()
@@ -177,14 +500,16 @@ class WordleHelper:
                 
         return tuple(pattern)
 
-    def calculate_entropy(self, candidates):
+    def calculate_entropy(self, candidates, top_k=None):
         """
         Global Entropy Calculation:
         使用「所有合法單字 (self.all_words)」作為猜測候選 (Guesses)，
         去切割「剩餘的可能答案 (candidates)」(Secrets)。
+        top_k: 只回傳前 k 名 (None = 完整排名)
         """
-        scores = []
         total_candidates = len(candidates)
+        if total_candidates == 0:
+            return []
         
         # 如果候選字只剩 1-2 個，直接猜候選字即可，不需要用 Global 搜尋
         if total_candidates <= 2:
@@ -192,9 +517,25 @@ class WordleHelper:
         else:
             guess_pool = self.all_words  # 開啟上帝視角：允許猜所有字
 
-        # 優化：如果 guess_pool 太大 (例如開局)，這裡會很慢。
-        # 但我們的 score() 已經有 >500 切換頻率法的保護，所以這裡通常 candidates < 500。
-        # 計算量 = 2300 (all words) * 200 (candidates) ≈ 460,000 次，Python 跑得動 (~0.5s)。
+        if self.patterns is None:
+            self.patterns = get_pattern_matrix(self.all_words)
+
+        if self._turn is not None:
+            self._turn.guess_pool = len(guess_pool)
+
+        # 優先使用預先計算的 pattern 矩陣 (查表，有 NumPy 時向量化)；
+        # 若有單字不在詞彙表內 (例如自訂 words)，退回逐字比對
+        with self._phase('entropy'):
+            scores = entropy_scores(self.patterns, guess_pool, candidates)
+            if scores is None:
+                scores = self._calculate_entropy_slow(candidates, guess_pool)
+
+        return rank_scores(scores, top_k)
+
+    def _calculate_entropy_slow(self, candidates, guess_pool):
+        scores = []
+        total_candidates = len(candidates)
+        candidate_set = set(candidates)
 
         for guess in guess_pool:
             pattern_counts = Counter()
@@ -210,26 +551,72 @@ class WordleHelper:
                 if p > 0:
                     entropy -= p * math.log2(p)
             
-            # 【加分邏輯】：如果 Entropy 差不多，優先選「是候選字」的詞
-            # 這樣如果運氣好可以直接猜中
-            is_candidate_bonus = 0.0001 if guess in candidates else 0
+            is_candidate_bonus = CANDIDATE_BONUS if guess in candidate_set else 0
             
             scores.append((guess, entropy + is_candidate_bonus))
-            
-        scores.sort(key=lambda x: x[1], reverse=True)
         return scores
 
-    def score(self, mode, words, char_count):
+    def _entropy_cache_key(self, words, top_k=None):
+        # 相同的候選字集合 (例如同一開局 + 同一回饋) 在不同局之間反覆出現，
+        # 以 (模式, guess pool, 候選字指紋) 為 key 共用結果
+        if self.patterns is None:
+            self.patterns = get_pattern_matrix(self.all_words)
+        return (FREQ_ENTROPY, self.patterns.fingerprint, candidate_fingerprint(words), top_k)
+
+    def _cached_entropy(self, words, top_k=None):
+        key = self._entropy_cache_key(words, top_k)
+        cached = score_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        scores = self.calculate_entropy(words, top_k)
+        score_cache.put(key, tuple(scores))
+        return scores
+
+    def _lookahead(self, words):
+        if not words:
+            return []
+        if self.patterns is None:
+            self.patterns = get_pattern_matrix(self.all_words)
+        # 結果取決於時間預算，同一候選字集合第一次算出的排名要留下來，
+        # 之後的分頁 / 完整排名才會與第一頁一致
+        key = (FREQ_LOOKAHEAD, self.patterns.fingerprint, candidate_fingerprint(words),
+               self.lookahead_budget, config.LOOKAHEAD_NODE_BUDGET)
+        cached = score_cache.get(key)
+        if cached is not None:
+            return list(cached)
+        guess_pool = words if len(words) <= 2 else self.all_words
+        if self._turn is not None:
+            self._turn.guess_pool = len(guess_pool)
+        with self._phase('lookahead'):
+            scores = lookahead_scores(
+                self.patterns, guess_pool, words,
+                time_budget=self.lookahead_budget,
+                node_budget=config.LOOKAHEAD_NODE_BUDGET,
+            )
+        if scores is None:
+            # 有單字不在 pattern 矩陣內：退回一步 Entropy
+            scores = self.calculate_entropy(words)
+        score_cache.put(key, tuple(scores))
+        return scores
+
+    def score(self, mode, words, char_count, top_k=None):
+        # top_k: 只需要前 k 名時用 heap 取代完整排序 (None = 完整排名)
         # 智慧切換邏輯
         count = len(words)
+
+        # 兩步前瞻：每個候選字集合的排名只算一次 (見 _lookahead)
+        if mode == FREQ_LOOKAHEAD:
+            scores = self._lookahead(words)
+            return scores if top_k is None else scores[:top_k]
         
-        # 如果指定 Entropy 模式，但單字量太大 (>500)，自動降級為 Unique Frequency
-        if mode == FREQ_ENTROPY:
-            if count > 500:
-                # 為了速度，暫時切換回頻率模式
-                mode = FREQ_UNIQUE 
+        # Entropy 模式：只有在設定了候選字上限且超過時，才降級為 Unique Frequency
+        # (Tree 模式走出策略樹外時同樣以 Entropy 評分)
+        if mode in (FREQ_ENTROPY, FREQ_TREE):
+            budget = self.entropy_max_candidates
+            if budget is not None and count > budget:
+                mode = FREQ_UNIQUE
             else:
-                return self.calculate_entropy(words)
+                return self._cached_entropy(words, top_k)
 
         # 既有的 Frequency 邏輯
         if mode == FREQ_REPEAT:
@@ -241,23 +628,174 @@ class WordleHelper:
                     for f in range(1, 1 + freq):
                         score += char_count[char * f]
                 word_scores.append((word, score))
-            word_scores.sort(key=lambda x: x[1], reverse=True)
-            return word_scores
+            return rank_scores(word_scores, top_k)
         else: # FREQ_UNIQUE or Fallback
             word_scores = []
             for word in words:
                 score = sum(char_count[char.lower()] for char in set(word))
                 word_scores.append((word, score))
-            word_scores.sort(key=lambda x: x[1], reverse=True)
-            return word_scores
+            return rank_scores(word_scores, top_k)
+
+    def _rescore(self, deferred=False):
+        """
+        候選字變動後重新計算分數；開局前兩手優先查開局書。
+        deferred=True 時 (策略樹與開局書仍會查) 不評分，留到 get_top_guesses 時才計算
+        """
+        with self._phase('frequency'):
+            self._refresh_freq()
+        with self._phase('lookup'):
+            tree_scores = self._lookup_strategy_tree()
+            book_scores = self._lookup_opening_book() if tree_scores is None else None
+        if tree_scores is not None:
+            self.word_scores, self._scores_complete = tree_scores
+            source = 'tree'
+        elif book_scores is not None:
+            self.word_scores = book_scores
+            self._scores_complete = len(book_scores) < config.OPENING_BOOK_DEPTH
+            source = 'book'
+        elif deferred:
+            self.word_scores = []
+            self._scores_complete = False
+            source = 'deferred'
+        else:
+            # 每回合只排出前 SCORE_TOP_K 名，完整排名延遲到有人需要時才計算
+            top_k = config.SCORE_TOP_K
+            with self._phase('score'):
+                self.word_scores = self._current_scores(top_k)
+            self._scores_complete = len(self.word_scores) < top_k
+            source = 'score'
+        if self._turn is not None:
+            self._turn.source = source
+
+    def _current_scores(self, top_k=None):
+        # Frequency 模式：列號陣列時整批計算；list 時直接排序增量維護的分數
+        if self._vectorized() and self.mode in FREQUENCY_MODES:
+            indices = self._candidate_indices()
+            scores = self.table.unique_scores(indices, self._table_letter_counts())
+            return self.table.rank(indices, scores, top_k)
+        if self._freq_scores is not None and self._freq_words is self.words:
+            return rank_scores(list(self._freq_scores.items()), top_k)
+        return self.score(self.mode, self.words, self.char_count, top_k)
+
+    def _lookup_strategy_tree(self):
+        # Tree 模式：只需走到樹上的節點 (O(1))；節點保存了前幾名建議，
+        # 要求更多時才以 Entropy 計算完整排名。回傳 (scores, 是否完整) 或 None
+        if not self.use_strategy_tree:
+            return None
+        tree = get_strategy_tree(self.all_words, self._load_past_answers(), self.strategy)
+        return tree.suggestions(self.guess_history) if tree is not None else None
+
+    def _lookup_opening_book(self):
+        if not self.use_opening_book or len(self.guess_history) > 1:
+            return None
+        book = get_opening_book(self.all_words, self._load_past_answers(), self.mode, self._score_candidates)
+        return book.lookup(self.mode, self.history_excluded, self.guess_history)
+
+    def _score_candidates(self, candidates, top_k=None):
+        return self.score(self.mode, candidates, self._analyze_unique_char_freq(candidates), top_k)
+
+    def _ensure_scores(self, top_n):
+        # 開局書與每回合評分只有前幾名，要求更多時 (例如網頁分頁) 才計算完整排名
+        if not self._scores_complete and top_n > len(self.word_scores):
+            with self._turn_scope('expand'), self._phase('score'):
+                full_scores = self._current_scores()
+            if self.mode == FREQ_TREE and self.word_scores:
+                # 策略樹的猜測固定排第一
+                pinned = self.word_scores[0]
+                full_scores = [pinned] + [item for item in full_scores if item[0] != pinned[0]]
+            self.word_scores = full_scores
+            self._scores_complete = True
+
+    @property
+    def scores_pending(self):
+        """評分被延遲 (deferred) 且尚未計算"""
+        return not self.word_scores and not self._scores_complete
+
+    def quick_guesses(self, top_n=10):
+        """
+        不論 mode，以 Unique Frequency 快速排出前 top_n 名 (毫秒級)。
+        給 GUI 在 Entropy 等較慢的排名算好之前先顯示
+        """
+        self._refresh_freq()
+        if self._vectorized():
+            indices = self._candidate_indices()
+            scores = self.table.unique_scores(indices, self._table_letter_counts())
+            ranked = self.table.rank(indices, scores, top_n)
+        elif self._freq_scores is not None and self._freq_words is self.words:
+            ranked = rank_scores(list(self._freq_scores.items()), top_n)
+        else:
+            ranked = self.score(FREQ_UNIQUE, self.words, self.char_count, top_n)
+        return [word for word, score in ranked]
 
     def get_best_guess(self):
+        self._ensure_scores(1)
         return self.word_scores[0][0] if self.word_scores else None
 
     def get_top_guesses(self, top_n=10):
+        self._ensure_scores(top_n)
         return [word for word, score in self.word_scores[:top_n]]
 
+    def _needs_progressive_entropy(self, top_n):
+        """get_top_guesses(top_n) 是否需要重新計算整個 guess pool 的 Entropy"""
+        if self._scores_complete or top_n <= len(self.word_scores):
+            return False
+        if self.mode not in (FREQ_ENTROPY, FREQ_TREE):
+            return False
+        count = self._candidate_count()
+        if count <= 2:
+            return False
+        budget = self.entropy_max_candidates
+        if budget is not None and count > budget:
+            return False
+        return self._entropy_cache_key(self.words) not in score_cache
+
+    def iter_top_guesses(self, top_n=10, chunk_size=None):
+        """
+        Anytime 版的 get_top_guesses：依序產生 (suggestions, final)。
+        需要計算 Entropy 時先產生 quick_guesses 的 Frequency 排名，再把 guess pool 依頻率分數
+        由高到低分批 (chunk_size 個) 計算 Entropy，每批之後 (排名有變動時) 產生目前已評分的字中的前 top_n 名。
+        最後一次 (final=True) 與 get_top_guesses(top_n) 相同 (結果寫入評分快取，之後分頁不必重算)
+        """
+        if not self._needs_progressive_entropy(top_n):
+            yield self.get_top_guesses(top_n), True
+            return
+
+        # Tree 模式：策略樹的猜測固定排第一
+        pinned = [self.word_scores[0][0]] if self.mode == FREQ_TREE and self.word_scores else []
+
+        def provisional(ranked):
+            rest = [word for word in ranked if word not in pinned]
+            return (pinned + rest)[:top_n]
+
+        last = provisional(self.quick_guesses(top_n))
+        yield last, False
+
+        words = self.words
+        guess_pool = self.all_words
+        order = [word for word, score in self.score(FREQ_UNIQUE, guess_pool, self.char_count)]
+        chunk_size = chunk_size or config.PROGRESSIVE_CHUNK_SIZE
+        scores = {}
+        for start in range(0, len(order), chunk_size):
+            chunk = entropy_scores(self.patterns, order[start:start + chunk_size], words)
+            if chunk is None:
+                # 有單字不在 pattern 矩陣內：直接走一般路徑 (逐字比對)
+                break
+            scores.update(chunk)
+            if start + chunk_size < len(order):
+                current = provisional(word for word, score in rank_scores(list(scores.items()), top_n + len(pinned)))
+                # 排名沒有變動時不重複產生
+                if current != last:
+                    last = current
+                    yield current, False
+        else:
+            # 與 calculate_entropy 相同：依 guess pool 原順序排名 (同分時順序一致)
+            ranked = rank_scores([(word, scores[word]) for word in guess_pool])
+            score_cache.put(self._entropy_cache_key(words), tuple(ranked))
+
+        yield self.get_top_guesses(top_n), True
+
     def print_word_scores(self, top_n=20):
+        self._ensure_scores(top_n)
         print(f"Top {top_n} words by score:")
         for word, score in self.word_scores[:top_n]:
             # 分數可能是 float (entropy) 或 int (frequency)
@@ -267,30 +805,29 @@ class WordleHelper:
                 print(f"{word}: {score}")
         print()
     
-    def filter_words(self, guess, feedback):
-        filtered = []
-        for word in self.words:
-            word = word.upper()
-            valid = True
-            for i in range(5):
-                if feedback[i] == 'G':
-                    if word[i] != guess[i]:
-                        valid = False
-                        break
-                elif feedback[i] == 'Y':
-                    if word[i] == guess[i] or guess[i] not in word:
-                        valid = False
-                        break
-                elif feedback[i] == 'X':
-                    if word[i] == guess[i] or any(word[j] == guess[i] and feedback[j] != 'G' for j in range(5) if j != i):
-                        valid = False
-                        break
-            if not valid:
-                continue
-            filtered.append(word)
-        self.words = filtered
-        self.char_count = self.analyze_freq()
-        self.word_scores = self.score(self.mode, self.words, self.char_count)
+    def filter_words(self, guess, feedback, deferred=False):
+        # deferred=True：只更新候選字，評分 (Entropy 等) 延遲到 get_top_guesses 時才計算，
+        # 呼叫端可以先用 quick_guesses 顯示 (GUI 的背景計算)
+        # 已載入 pattern 矩陣時與「和 (guess, feedback) 一致的答案」bitset 取交集 (快取，跨局共用)，
+        # 否則 (guess, feedback) 先編譯成位置 mask 與字母上下限；有 WordTable 時整批向量化比對
+        with self._turn_scope('filter'):
+            with self._phase('filter'):
+                if self._bits is not None:
+                    self._set_bits(self._filter_bits(guess, feedback))
+                else:
+                    self._set_words(filter_candidates(self.words, guess, feedback, self.patterns))
+            self.guess_history.append((guess.upper(), feedback.upper()))
+            self._rescore(deferred)
+
+    def _filter_bits(self, guess, feedback):
+        guess = guess.upper()
+        if self.patterns is not None:
+            consistent = self.bitsets.consistent(self.patterns, guess, feedback_to_code(feedback))
+            if consistent is not None:
+                return self._bits & consistent
+        if self.table is not None:
+            return self.bitsets.from_indices(self.table.filter(self._candidate_indices(), guess, feedback))
+        return self.bitsets.from_words(filter_candidates(self.words, guess, feedback))
 
     def play(self, num_suggestions=10, quiet=False):
         # 這裡的 play 邏輯保持不變，因為主要的改變是在 score() 內部
@@ -302,8 +839,15 @@ class WordleHelper:
             elif self.history_excluded:
                 print("(Wordle Mode: Past answers excluded from start)")
             
-            if self.mode == FREQ_ENTROPY:
-                print("(Algorithm: Smart Entropy - Auto-switch based on remaining words)")
+            if self.mode == FREQ_TREE:
+                print("(Algorithm: Strategy Tree - Entropy when off the tree)")
+            elif self.mode == FREQ_LOOKAHEAD:
+                print(f"(Algorithm: Two-ply Lookahead - {self.lookahead_budget * 1000:.0f} ms per turn)")
+            elif self.mode == FREQ_ENTROPY:
+                if self.entropy_max_candidates is None:
+                    print("(Algorithm: Global Entropy)")
+                else:
+                    print(f"(Algorithm: Smart Entropy - Frequency above {self.entropy_max_candidates} remaining words)")
             
             print("Example: GYXXG")
             print()
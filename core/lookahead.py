@@ -0,0 +1,121 @@
+import heapq
+import math
+import time
+from collections import Counter
+from operator import itemgetter
+from .entropy import entropy_scores, partition_stats, histograms_numpy, CANDIDATE_BONUS
+from .patterns import ALL_GREEN
+from ._np import np
+
+# 逐步加寬：第一輪評估的猜測數，之後每輪加倍
+INITIAL_WIDTH = 4
+# 沒有 NumPy 時，每個分組只比較 Entropy 前幾名的後續猜測
+PURE_PYTHON_FOLLOWUPS = 5
+
+
+def _sizes_from_counts(counts, total):
+    """猜完之後「剩餘候選字數」的期望值 = sum(|class|^2) / total"""
+    return sum(c * c for c in counts) / total
+
+
+def best_followup_size(matrix, guess_pool, candidates):
+    """
+    candidates 已知時，再猜一次能達到的最小期望剩餘候選字數。
+    NumPy 版本一次比較整個 guess_pool；純 Python 只比較 Entropy 前幾名。
+    """
+    size = len(candidates)
+    if size <= 2:
+        # 直接猜其中一個就能分開
+        return 1.0
+
+    secret_idx = matrix.indices(candidates)
+    array = matrix.as_array() if np is not None else None
+    if array is not None:
+        guess_idx = np.asarray(matrix.indices(guess_pool), dtype=np.intp)
+        codes = array[np.ix_(guess_idx, np.asarray(secret_idx, dtype=np.intp))]
+        hist = histograms_numpy(codes).astype(np.int64)
+        return float((hist * hist).sum(axis=1).min()) / size
+
+    scores = entropy_scores(matrix, guess_pool, candidates)
+    followups = [w for w, _ in heapq.nlargest(PURE_PYTHON_FOLLOWUPS, scores, key=itemgetter(1))]
+    best = None
+    for guess in followups:
+        row = matrix.row(guess)
+        expected = _sizes_from_counts(Counter(row[i] for i in secret_idx).values(), size)
+        if best is None or expected < best:
+            best = expected
+    return best
+
+
+def lookahead_scores(matrix, guess_pool, candidates, time_budget=None, node_budget=None):
+    """
+    兩步前瞻評分。
+    每個猜測字的分數 = log2(N / E)，E 為「這一猜 + 最佳後續一猜」之後的期望剩餘候選字數，
+    越高越好。
+
+    以一步 Entropy 排名剪枝：先評估前 INITIAL_WIDTH 名，時間 / 節點預算還夠就加倍寬度。
+    時間從進入函式開始計算 (含一步評分)，每個分組之間都會檢查，超過時放棄評估到一半的字。
+    沒評估到的字以「只猜這一步」的期望剩餘數 E1 計分：後續一猜只會讓 E 變小，
+    所以 log2(N / E1) 是它兩步分數的下限，與已評估的字在同一個尺度上一起排序。
+    回傳 [(word, score)]，依分數排序。單字不在 pattern 矩陣內時回傳 None。
+    """
+    start_time = time.perf_counter()
+    deadline = start_time + time_budget if time_budget is not None else None
+
+    stats = partition_stats(matrix, guess_pool, candidates)
+    if stats is None:
+        return None
+    # 依一步 Entropy 決定評估順序
+    stats.sort(key=itemgetter(1), reverse=True)
+
+    total = len(candidates)
+    if total <= 2:
+        return [(guess, entropy) for guess, entropy, _ in stats]
+
+    secret_idx = matrix.indices(candidates)
+    candidate_set = set(candidates)
+    log_total = math.log2(total)
+
+    def score(guess, expected):
+        bonus = CANDIDATE_BONUS if guess in candidate_set else 0
+        return log_total - math.log2(expected) + bonus
+
+    def out_of_time():
+        return deadline is not None and time.perf_counter() >= deadline
+
+    evaluated = {}
+    nodes = 0
+    width = INITIAL_WIDTH
+    position = 0
+    stopped = out_of_time()
+    while not stopped and position < len(stats):
+        for guess, _, _ in stats[position:width]:
+            row = matrix.row(guess)
+            groups = {}
+            for word, i in zip(candidates, secret_idx):
+                groups.setdefault(row[i], []).append(word)
+
+            expected = 0.0
+            for code, group in groups.items():
+                if out_of_time():
+                    stopped = True
+                    break
+                if code == ALL_GREEN:
+                    expected += 1 / total  # 直接猜中
+                    continue
+                expected += len(group) / total * best_followup_size(matrix, guess_pool, group)
+                nodes += 1
+            if stopped:
+                break
+
+            evaluated[guess] = score(guess, expected)
+            position += 1
+            if node_budget is not None and nodes >= node_budget:
+                stopped = True
+                break
+        width *= 2
+
+    scores = [(guess, evaluated[guess] if guess in evaluated else score(guess, size))
+              for guess, _, size in stats]
+    scores.sort(key=itemgetter(1), reverse=True)
+    return scores
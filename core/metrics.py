@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import deque
+from . import config
+
+
+class TurnRecord:
+    """
+    WordleHelper 一個回合的量測結果。
+    timings: 各階段 ('filter', 'frequency', 'lookup', 'score', 'entropy', 'lookahead') 的秒數，
+    entropy / lookahead 包含在 score 之內
+    event: 'init' (建立) / 'filter' (輸入回饋) / 'exclude' (排除歷史) / 'expand' (展開完整排名)
+    source: 本回合建議的來源 ('tree' / 'book' / 'score'；'deferred' = 評分延後到 expand)
+    guess_pool: Entropy 計算時的猜測字數 (沒有計算時為 None)
+    """
+
+    __slots__ = ('event', 'mode', 'turn', 'candidates_before', 'candidates', 'guess_pool', 'source', 'timings', 'total', '_start')
+
+    def __init__(self, event, mode, turn, candidates_before):
+        self.event = event
+        self.mode = mode
+        self.turn = turn
+        self.candidates_before = candidates_before
+        self.candidates = candidates_before
+        self.guess_pool = None
+        self.source = None
+        self.timings = {}
+        self.total = 0.0
+        self._start = time.perf_counter()
+
+    def add(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def finish(self, candidates):
+        self.candidates = candidates
+        self.total = time.perf_counter() - self._start
+
+    def as_dict(self):
+        return {
+            'event': self.event,
+            'mode': self.mode,
+            'turn': self.turn,
+            'candidates_before': self.candidates_before,
+            'candidates': self.candidates,
+            'guess_pool': self.guess_pool,
+            'source': self.source,
+            'timings_ms': {phase: seconds * 1000 for phase, seconds in self.timings.items()},
+            'total_ms': self.total * 1000,
+        }
+
+    def summary(self):
+        phases = ", ".join(f"{phase} {seconds * 1000:.1f}" for phase, seconds in self.timings.items())
+        pool = f", pool {self.guess_pool}" if self.guess_pool is not None else ""
+        return (f"turn {self.turn} {self.event}: {self.candidates_before} -> {self.candidates} words{pool}, "
+                f"{self.total * 1000:.1f} ms ({phases})")
+
+
+class Metrics:
+    """
+    TurnRecord 的彙總 (thread-safe)，本身可直接當成 WordleHelper 的 on_turn callback。
+    記錄各事件次數、每個階段的次數 / 總時間 / 最大值、最近的回合，
+    以及超過 slow_turn_ms 的慢回合 (用來找出超出延遲預算的狀態)。
+    """
+
+    def __init__(self, slow_turn_ms=None, max_recent=50):
+        self.slow_turn_ms = slow_turn_ms if slow_turn_ms is not None else config.METRICS_SLOW_TURN_MS
+        self.max_recent = max_recent
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, record):
+        self.record(record)
+
+    def reset(self):
+        with self._lock:
+            self.turns = 0
+            self.events = {}
+            self.phases = {}
+            self.total_seconds = 0.0
+            self.recent = deque(maxlen=self.max_recent)
+            self.slow = deque(maxlen=self.max_recent)
+            self.slow_count = 0
+
+    def record(self, record):
+        with self._lock:
+            self.turns += 1
+            self.events[record.event] = self.events.get(record.event, 0) + 1
+            self.total_seconds += record.total
+            for phase, seconds in record.timings.items():
+                stats = self.phases.setdefault(phase, [0, 0.0, 0.0])
+                stats[0] += 1
+                stats[1] += seconds
+                stats[2] = max(stats[2], seconds)
+            data = record.as_dict()
+            self.recent.append(data)
+            if record.total * 1000 > self.slow_turn_ms:
+                self.slow_count += 1
+                self.slow.append(data)
+
+    def snapshot(self):
+        """JSON 相容的彙總結果 (給 /metrics)"""
+        with self._lock:
+            return {
+                'turns': self.turns,
+                'events': dict(self.events),
+                'total_ms': self.total_seconds * 1000,
+                'phases': {
+                    phase: {
+                        'count': count,
+                        'total_ms': total * 1000,
+                        'mean_ms': total / count * 1000 if count else 0.0,
+                        'max_ms': peak * 1000,
+                    }
+                    for phase, (count, total, peak) in self.phases.items()
+                },
+                'slow_turn_ms': self.slow_turn_ms,
+                'slow_turns': self.slow_count,
+                'recent_slow': list(self.slow),
+                'recent': list(self.recent),
+            }
+
+
+# 單一 process 共用的彙總 (網頁後端使用)
+metrics = Metrics()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import threading
+from . import config
+from .fileutil import atomic_write
+from .patterns import get_pattern_matrix, code_to_feedback, NUM_PATTERNS
+
+# 格式變動時遞增，舊檔會自動重建
+BOOK_VERSION = 1
+
+
+def state_key(mode, excluded, history):
+    """
+    開局狀態的 key。
+    state 由 (演算法, 是否已排除歷史答案, 已猜過的 (guess, feedback)) 唯一決定，
+    因為「過濾」與「排除歷史」的順序不影響剩餘候選字。
+    """
+    steps = ",".join(f"{guess}:{feedback}" for guess, feedback in history)
+    return f"{mode}|{int(bool(excluded))}|{steps}"
+
+
+def book_fingerprint(words, past_answers):
+    digest = hashlib.sha1()
+    digest.update(f"v{BOOK_VERSION}|{config.OPENING_BOOK_DEPTH}\n".encode('utf-8'))
+    digest.update("\n".join(words).encode('utf-8'))
+    digest.update(b"\n--\n")
+    digest.update("\n".join(sorted(past_answers)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class OpeningBook:
+    """
+    預先計算的開局書：每種演算法 × (保留 / 排除歷史) 的第一猜排名，
+    以及最佳第一猜之後每一種 feedback 的第二猜排名 (含 Hybrid 在第 2 猜前排除歷史的情況)。
+    每個狀態只存前 OPENING_BOOK_DEPTH 名；需要更多時由 WordleHelper 自行完整計算。
+    詞彙表或歷史答案變動時 (fingerprint 不同) 整本書會重建。
+    """
+
+    def __init__(self, fingerprint, entries=None, modes=None):
+        self.fingerprint = fingerprint
+        self.entries = entries if entries is not None else {}
+        self.modes = set(modes) if modes else set()
+
+    def lookup(self, mode, excluded, history):
+        """O(1) 查詢；不在書中時回傳 None"""
+        scores = self.entries.get(state_key(mode, excluded, history))
+        if scores is None:
+            return None
+        return [tuple(item) for item in scores]
+
+    def build_mode(self, mode, words, past_answers, score_fn):
+        """
+        計算某演算法的所有開局狀態。
+        score_fn(candidates, top_k) -> 排序後的前 top_k 名 [(word, score)]
+        """
+        depth = config.OPENING_BOOK_DEPTH
+        matrix = get_pattern_matrix(words)
+        standard = list(words)
+        excluded = [w for w in words if w not in past_answers]
+
+        for is_excluded, candidates in ((False, standard), (True, excluded)):
+            opening = score_fn(candidates, depth)
+            self.entries[state_key(mode, is_excluded, ())] = opening
+            if not opening:
+                continue
+
+            # 依 pattern code 把候選字分組 (查表，一次掃描)
+            opener = opening[0][0]
+            row = matrix.row(opener)
+            groups = [[] for _ in range(NUM_PATTERNS)]
+            for word in candidates:
+                groups[row[matrix.index[word]]].append(word)
+
+            for code, group in enumerate(groups):
+                if not group:
+                    continue
+                history = ((opener, code_to_feedback(code)),)
+                self.entries[state_key(mode, is_excluded, history)] = score_fn(group, depth)
+                if not is_excluded:
+                    # Hybrid：第 1 猜用完整詞彙表，第 2 猜前才排除歷史答案
+                    remaining = [w for w in group if w not in past_answers]
+                    self.entries[state_key(mode, True, history)] = score_fn(remaining, depth)
+
+        self.modes.add(mode)
+
+    # --- 存取 ---
+
+    @classmethod
+    def load(cls, fingerprint, path=None):
+        target_path = path if path else config.OPENING_BOOK_PATH
+        try:
+            with open(target_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError, OSError):
+            return cls(fingerprint)
+        if data.get('version') != BOOK_VERSION or data.get('fingerprint') != fingerprint:
+            return cls(fingerprint)
+        return cls(fingerprint, data.get('entries', {}), data.get('modes', []))
+
+    def save(self, path=None):
+        target_path = os.fspath(path if path else config.OPENING_BOOK_PATH)
+        data = {
+            'version': BOOK_VERSION,
+            'fingerprint': self.fingerprint,
+            'modes': sorted(self.modes),
+            'entries': self.entries,
+        }
+        try:
+            with atomic_write(target_path) as f:
+                json.dump(data, f, separators=(',', ':'))
+        except OSError as e:
+            print(f"[Opening Book] Warning: Failed to save opening book: {e}")
+
+
+# 每個 process 共用一本；詞彙表 / 歷史答案物件換掉 (檔案變動) 時重新載入
+_book = None
+_book_source = None
+_book_lock = threading.Lock()
+
+
+def get_opening_book(words, past_answers, mode, score_fn):
+    """取得包含指定演算法的開局書，必要時建立並寫回 data/"""
+    global _book, _book_source
+    source = (words, past_answers)
+    book = _book
+    if book is not None and _book_source is not None and all(a is b for a, b in zip(_book_source, source)) and mode in book.modes:
+        return book
+
+    with _book_lock:
+        fingerprint = book_fingerprint(words, past_answers)
+        if _book is None or _book.fingerprint != fingerprint:
+            _book = OpeningBook.load(fingerprint)
+        _book_source = source
+        if mode not in _book.modes:
+            print(f"[Opening Book] Building '{mode}' openings...")
+            _book.build_mode(mode, words, past_answers, score_fn)
+            _book.save()
+        return _book
@@ -0,0 +1,216 @@
+import hashlib
+import mmap
+import os
+import struct
+from . import config
+from .fileutil import atomic_write
+from ._np import np
+
+# Pattern 編碼：把 5 格回饋視為 base-3 整數 (位置 0 為最高位)
+# 0=Gray, 1=Yellow, 2=Green，因此 XXXXX=0，GGGGG=242
+NUM_PATTERNS = 3 ** 5
+ALL_GREEN = NUM_PATTERNS - 1
+
+FEEDBACK_DIGITS = {'X': 0, 'Y': 1, 'G': 2}
+FEEDBACK_CHARS = 'XYG'
+
+# 快取檔頭: magic, version, reserved, 單字數, 詞彙表指紋 (sha1)
+_MAGIC = b'WMPM'
+_VERSION = 1
+_HEADER = struct.Struct('<4sHHI20s')
+
+
+def encode_pattern(pattern):
+    """(2, 0, 1, 0, 0) -> base-3 整數"""
+    code = 0
+    for digit in pattern:
+        code = code * 3 + digit
+    return code
+
+
+def decode_pattern(code):
+    """base-3 整數 -> (2, 0, 1, 0, 0)"""
+    digits = [0] * 5
+    for i in range(4, -1, -1):
+        code, digits[i] = divmod(code, 3)
+    return tuple(digits)
+
+
+def feedback_to_code(feedback):
+    """'GXYXX' -> base-3 整數"""
+    return encode_pattern(FEEDBACK_DIGITS[c] for c in feedback.upper())
+
+
+def code_to_feedback(code):
+    """base-3 整數 -> 'GXYXX'"""
+    return "".join(FEEDBACK_CHARS[d] for d in decode_pattern(code))
+
+
+def pattern_code(secret, guess):
+    """直接計算 secret/guess 的 pattern code (與 WordleHelper.get_feedback_pattern 同規則)"""
+    digits = [0] * 5
+    remaining = []
+    for i in range(5):
+        if secret[i] == guess[i]:
+            digits[i] = 2
+        else:
+            remaining.append(secret[i])
+    for i in range(5):
+        if digits[i] != 2 and guess[i] in remaining:
+            digits[i] = 1
+            remaining.remove(guess[i])
+    return encode_pattern(digits)
+
+
+def vocab_fingerprint(words):
+    """詞彙表內容 (含順序) 的 sha1，用來判斷快取是否過期"""
+    return hashlib.sha1("\n".join(words).encode('utf-8')).digest()
+
+
+class PatternMatrix:
+    """
+    預先計算的 guess×secret 回饋矩陣。
+    第 g 列第 s 欄 = 以 words[g] 猜、答案為 words[s] 時的 pattern code (uint8)。
+    資料存在磁碟上並以 mmap 讀取，多個 process 可共用同一份 page cache。
+    """
+
+    def __init__(self, words, buffer, fingerprint=None):
+        self.words = tuple(words)
+        self.size = len(self.words)
+        self.fingerprint = fingerprint if fingerprint is not None else vocab_fingerprint(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self._buffer = buffer
+        self._array = None
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def row(self, guess):
+        """回傳 guess 對所有 secret 的 pattern codes (bytes，長度 = size)"""
+        start = self.index[guess] * self.size
+        return self._buffer[start:start + self.size]
+
+    def pattern(self, guess, secret):
+        return self._buffer[self.index[guess] * self.size + self.index[secret]]
+
+    def as_array(self):
+        """N×N uint8 NumPy view (不複製資料)；未安裝 NumPy 時回傳 None"""
+        if np is None:
+            return None
+        if self._array is None:
+            self._array = np.frombuffer(self._buffer, dtype=np.uint8).reshape(self.size, self.size)
+        return self._array
+
+    def indices(self, words):
+        """單字 -> 索引；只要有任何單字不在矩陣內就回傳 None"""
+        index = self.index
+        try:
+            return [index[w] for w in words]
+        except KeyError:
+            return None
+
+    # --- 建立與載入 ---
+
+    @staticmethod
+    def build_bytes(words):
+        """計算完整矩陣 (N*N bytes)。只在快取不存在時執行。"""
+        words = list(words)
+        if np is not None:
+            return PatternMatrix._build_bytes_numpy(words)
+        # 純 Python：2300 字約需 15 秒
+        size = len(words)
+        data = bytearray(size * size)
+        offset = 0
+        for guess in words:
+            for secret in words:
+                data[offset] = pattern_code(secret, guess)
+                offset += 1
+        return bytes(data)
+
+    @staticmethod
+    def _build_bytes_numpy(words):
+        # 每個 guess 一次向量化處理所有 secret
+        size = len(words)
+        letters = np.array([[ord(c) for c in w] for w in words], dtype=np.uint8).reshape(size, 5)
+        weights = np.array([81, 27, 9, 3, 1], dtype=np.uint8)
+        data = np.empty((size, size), dtype=np.uint8)
+        for g, guess in enumerate(letters):
+            green = letters == guess
+            digits = green.astype(np.uint8) * 2
+            not_green = ~green
+            used = {}
+            for i in range(5):
+                letter = guess[i]
+                # secret 中尚未被 Green 佔用的同字母數量，扣掉前面已配給 Yellow 的次數
+                available = ((letters == letter) & not_green).sum(axis=1)
+                taken = used.get(letter, 0)
+                yellow = not_green[:, i] & (available > taken)
+                digits[:, i] += yellow
+                used[letter] = taken + yellow
+            data[g] = digits @ weights
+        return data.tobytes()
+
+    @classmethod
+    def load(cls, words, path=None):
+        """
+        從快取檔 mmap 載入；檔案不存在或詞彙表已變動時重新計算並寫回。
+        資料夾不可寫入時退回純記憶體版本。
+        """
+        words = list(words)
+        target_path = path if path else config.PATTERN_MATRIX_PATH
+        fingerprint = vocab_fingerprint(words)
+
+        buffer = cls._map_file(target_path, len(words), fingerprint)
+        if buffer is not None:
+            return cls(words, buffer, fingerprint)
+
+        print(f"[Patterns] Building {len(words)}x{len(words)} pattern matrix...")
+        data = cls.build_bytes(words)
+        try:
+            cls._write_file(target_path, data, len(words), fingerprint)
+        except OSError as e:
+            print(f"[Patterns] Warning: Failed to cache pattern matrix: {e}")
+            return cls(words, data, fingerprint)
+
+        buffer = cls._map_file(target_path, len(words), fingerprint)
+        return cls(words, buffer if buffer is not None else data, fingerprint)
+
+    @staticmethod
+    def _map_file(path, size, fingerprint):
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(_HEADER.size)
+                if len(header) != _HEADER.size:
+                    return None
+                magic, version, _, count, digest = _HEADER.unpack(header)
+                if magic != _MAGIC or version != _VERSION or count != size or digest != fingerprint:
+                    return None
+                if os.fstat(f.fileno()).st_size != _HEADER.size + size * size:
+                    return None
+                if size == 0:
+                    return b''
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        # 略過檔頭；memoryview 切片不會複製資料
+        return memoryview(mapped)[_HEADER.size:]
+
+    @staticmethod
+    def _write_file(path, data, size, fingerprint):
+        # 原子性替換，避免其他 process 讀到寫到一半的檔案
+        with atomic_write(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, 0, size, fingerprint))
+            f.write(data)
+
+
+# 每個 process 只載入一次 (以詞彙表內容為 key)
+_matrices = {}
+
+
+def get_pattern_matrix(words, path=None):
+    key = (tuple(words), os.fspath(path) if path else None)
+    matrix = _matrices.get(key)
+    if matrix is None:
+        matrix = PatternMatrix.load(words, path)
+        _matrices[key] = matrix
+    return matrix
@@ -0,0 +1,155 @@
+from collections import Counter
+from .helper import WordleHelper, FREQ_UNIQUE
+from .patterns import pattern_code, code_to_feedback
+
+MAX_ATTEMPTS = 6
+STRATEGIES = ('standard', 'exclude', 'hybrid')
+
+
+def get_feedback(secret, guess):
+    """產生 Wordle 回饋字串 (G=Green, Y=Yellow, X=Gray)，重複字母依 Wordle 規則處理"""
+    return code_to_feedback(pattern_code(secret, guess))
+
+
+class SimulationResult:
+    """
+    simulate_many 的結果 (與 secrets 同順序)：
+    - guesses: 每局的猜測次數，失敗記為 max_attempts + 1
+    - traces: 每局依序猜過的字
+    """
+
+    def __init__(self, secrets, guesses, traces, max_attempts=MAX_ATTEMPTS):
+        self.secrets = list(secrets)
+        self.guesses = guesses
+        self.traces = traces
+        self.max_attempts = max_attempts
+
+    @property
+    def histogram(self):
+        """猜測次數 -> 局數 (失敗記在 max_attempts + 1)"""
+        return Counter(self.guesses)
+
+    @property
+    def distribution(self):
+        """第 1 ~ max_attempts 次猜中的局數"""
+        histogram = self.histogram
+        return [histogram[n] for n in range(1, self.max_attempts + 1)]
+
+    @property
+    def failures(self):
+        return sum(1 for g in self.guesses if g > self.max_attempts)
+
+    @property
+    def solved(self):
+        return [g for g in self.guesses if g <= self.max_attempts]
+
+    def average(self):
+        """成功局的平均猜測次數"""
+        solved = self.solved
+        return sum(solved) / len(solved) if solved else 0
+
+    def success_rate(self):
+        return (len(self.guesses) - self.failures) / len(self.guesses) * 100 if self.guesses else 0.0
+
+    def trace(self, secret):
+        return self.traces[self.secrets.index(secret)]
+
+
+def simulate_many(secrets, strategy='standard', mode=FREQ_UNIQUE, switch_after=1, past_answers=None,
+                  choose=None, max_attempts=MAX_ATTEMPTS, **helper_kwargs):
+    """
+    批次模擬多局遊戲。
+    :param strategy: 'standard' (保留歷史), 'exclude' (一開始就排除歷史), 'hybrid' (第 switch_after 猜後排除)
+    :param past_answers: 要排除的歷史答案 (None = 讀取歷史答案檔)
+    :param choose: choose(helper) -> guess，預設為最佳猜測；指定時 (例如隨機取前幾名) 每局各自計算
+    :return: SimulationResult
+
+    所有局共用同一個初始 helper (詞彙表、開局書只載入一次)。
+    使用預設的決定性選字時，依回饋把 secret 分組一起往下走 (見 _walk_states)：
+    同一開局、同一回饋的局共用後續狀態，每個狀態只 filter / score 一次。
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    root = WordleHelper(mode=mode, exclude_history=strategy == 'exclude', hybrid_mode=strategy == 'hybrid',
+                        past_answers=past_answers, verbose=False, **helper_kwargs)
+    exclude_at = switch_after + 1 if strategy == 'hybrid' else None
+
+    if choose is None:
+        return _walk_states(root, secrets, exclude_at, past_answers, max_attempts)
+
+    def advance(parent, step, attempt):
+        helper = parent.clone()
+        if step is not None:
+            helper.filter_words(*step)
+        if attempt == exclude_at:
+            helper.exclude_past_answers(past_answers, verbose=False)
+        return helper
+
+    # 自訂選字 (可能不具決定性)：每局各自進行
+    guesses = []
+    traces = []
+    for secret in secrets:
+        helper, step = root, None
+        result = max_attempts + 1
+        trace = []
+        for attempt in range(1, max_attempts + 1):
+            helper = advance(helper, step, attempt)
+            guess = choose(helper)
+            if guess is None:
+                break
+            trace.append(guess)
+            if guess == secret:
+                result = attempt
+                break
+            step = (guess, get_feedback(secret, guess))
+        guesses.append(result)
+        traces.append(trace)
+
+    return SimulationResult(secrets, guesses, traces, max_attempts)
+
+
+def _walk_states(root, secrets, exclude_at, past_answers, max_attempts):
+    """
+    決定性策略的模擬：把所有 secret 一起從根狀態往下走，
+    每個節點只選一次字，再依回饋把 secret 分組，每組只過濾一次。
+    整個評估等於走一遍策略樹，每個不同的遊戲狀態只計算一次，記憶體只保留目前路徑。
+    """
+    guesses = [max_attempts + 1] * len(secrets)
+    traces = [None] * len(secrets)
+
+    def visit(parent, step, attempt, positions, trace):
+        helper = parent
+        if step is not None or attempt == exclude_at:
+            helper = parent.clone()
+            if step is not None:
+                helper.filter_words(*step)
+            if attempt == exclude_at:
+                helper.exclude_past_answers(past_answers, verbose=False)
+
+        guess = helper.get_best_guess()
+        if guess is None:
+            for p in positions:
+                traces[p] = list(trace)
+            return
+        trace = trace + [guess]
+
+        groups = {}
+        for p in positions:
+            secret = secrets[p]
+            if secret == guess:
+                guesses[p] = attempt
+                traces[p] = list(trace)
+            else:
+                groups.setdefault(get_feedback(secret, guess), []).append(p)
+
+        for feedback, group in groups.items():
+            if attempt == max_attempts:
+                for p in group:
+                    traces[p] = list(trace)
+            else:
+                visit(helper, (guess, feedback), attempt + 1, group, trace)
+
+    if secrets:
+        visit(root, None, 1, list(range(len(secrets))), [])
+    return SimulationResult(secrets, guesses, traces, max_attempts)
@@ -0,0 +1,279 @@
+import heapq
+import json
+from operator import itemgetter
+from . import config
+from .fileutil import atomic_write
+from .patterns import get_pattern_matrix, code_to_feedback, ALL_GREEN
+from .entropy import entropy_scores, CANDIDATE_BONUS
+from .opening_book import book_fingerprint
+from .vocab import vocabulary_store
+
+# 策略樹格式版本，變動時舊檔自動失效
+TREE_VERSION = 2
+MAX_GUESSES = 6
+# 每個猜不到的答案計入的成本 (遠大於任何可行解，讓搜尋優先避免失敗)
+FAIL_COST = 100
+
+STRATEGIES = ('standard', 'exclude', 'hybrid')
+
+
+def tree_path(strategy):
+    return config.DATA_DIR / f'strategy_tree_{strategy}.json'
+
+
+def tree_fingerprint(words, past_answers, strategy):
+    # standard 策略與歷史答案無關，歷史更新時不需要重建
+    relevant_answers = past_answers if strategy != 'standard' else ()
+    return f"{strategy}:{book_fingerprint(words, relevant_answers)}"
+
+
+class TreeSolver:
+    """
+    離線搜尋 (近似) 最佳猜測樹。
+    目標：所有答案的猜測次數總和最小 (= 平均猜測次數最小)。
+    - 每個節點只嘗試 Entropy 排名前 beam 名的猜測字 (加上最好的幾個候選字)
+    - 以 2n-1 (每個答案至少再猜 1~2 次) 為下界剪枝
+    - 以候選字集合 + 深度做 memoization
+    """
+
+    def __init__(self, words, beam=8, candidate_beam=3, alternatives=None):
+        self.words = tuple(words)
+        self.matrix = get_pattern_matrix(self.words)
+        self.beam = beam
+        self.candidate_beam = candidate_beam
+        # 每個節點另外保存的 Entropy 排名數 (WordleHelper 每回合顯示的前幾名)
+        self.alternatives = alternatives if alternatives is not None else config.SCORE_TOP_K
+        self._memo = {}
+        self._ranked = {}
+        self.nodes = 0
+
+    @staticmethod
+    def lower_bound(size):
+        # 猜候選字且剩下的都能一次分開：1 + 2 * (n - 1)
+        return 2 * size - 1 if size else 0
+
+    def _partition(self, guess, candidates):
+        row = self.matrix.row(guess)
+        index = self.matrix.index
+        groups = {}
+        for word in candidates:
+            groups.setdefault(row[index[word]], []).append(word)
+        return groups
+
+    def _scores(self, candidates):
+        # guess pool 與 WordleHelper.calculate_entropy 相同：只剩 1~2 個候選字時只猜候選字
+        guess_pool = candidates if len(candidates) <= 2 else self.words
+        scores = entropy_scores(self.matrix, guess_pool, candidates)
+        # 與 rank_scores 相同的前幾名 (同分時的順序一致)
+        self._ranked[tuple(candidates)] = heapq.nlargest(self.alternatives, scores, key=itemgetter(1))
+        return scores
+
+    def ranked(self, candidates, guess):
+        """
+        節點上的建議排名 [(word, entropy)]：策略樹的猜測排第一，其餘依 Entropy 排序，
+        共 self.alternatives 名 (與 WordleHelper 在這個狀態下評分的前幾名相同)
+        """
+        key = tuple(candidates)
+        if key not in self._ranked:
+            self._scores(candidates)
+        ranked = self._ranked[key]
+        pinned = [item for item in ranked if item[0] == guess]
+        if not pinned:
+            pinned = entropy_scores(self.matrix, [guess], candidates)
+        rest = [item for item in ranked if item[0] != guess]
+        return [[word, round(score, 6)] for word, score in pinned + rest[:self.alternatives - 1]]
+
+    def _guess_options(self, candidates):
+        """本節點要嘗試的猜測字 (Entropy 高到低)"""
+        if len(candidates) <= 2:
+            return list(candidates)
+        scores = self._scores(candidates)
+        top = [w for w, _ in heapq.nlargest(self.beam, scores, key=itemgetter(1))]
+        candidate_set = set(candidates)
+        in_candidates = [item for item in scores if item[0] in candidate_set]
+        top_candidates = [w for w, _ in heapq.nlargest(self.candidate_beam, in_candidates, key=itemgetter(1))]
+        return top + [w for w in top_candidates if w not in top]
+
+    def solve(self, candidates, depth=0, guess_options=None):
+        """
+        回傳 (cost, node)。
+        cost = 所有候選答案的猜測次數總和；node 為序列化格式 (見 StrategyTree)。
+        depth = 已經用掉的猜測次數。
+        """
+        candidates = tuple(candidates)
+        size = len(candidates)
+        if size == 0:
+            return 0, None
+        if depth >= MAX_GUESSES:
+            return FAIL_COST * size, None
+        if size == 1:
+            return 1, candidates[0]
+
+        key = (candidates, depth)
+        if guess_options is None and key in self._memo:
+            return self._memo[key]
+
+        self.nodes += 1
+        options = guess_options if guess_options is not None else self._guess_options(candidates)
+        if depth == MAX_GUESSES - 1:
+            # 最後一次：只能猜候選字，其他答案都算失敗
+            options = [w for w in options if w in set(candidates)] or [candidates[0]]
+
+        best_cost, best_node = None, None
+        for guess in options:
+            groups = self._partition(guess, candidates)
+            if len(groups) == 1 and ALL_GREEN not in groups:
+                continue  # 完全沒有分開候選字
+
+            # 先處理小的分組，較快觸發剪枝
+            ordered = sorted(groups.items(), key=lambda item: len(item[1]))
+            remaining_bound = sum(self.lower_bound(len(g)) for code, g in ordered if code != ALL_GREEN)
+            cost = size
+            children = {}
+            for code, group in ordered:
+                if code == ALL_GREEN:
+                    continue
+                remaining_bound -= self.lower_bound(len(group))
+                if best_cost is not None and cost + self.lower_bound(len(group)) + remaining_bound >= best_cost:
+                    cost = None
+                    break
+                child_cost, child_node = self.solve(group, depth + 1)
+                cost += child_cost
+                children[code_to_feedback(code)] = child_node
+
+            if cost is not None and (best_cost is None or cost < best_cost):
+                best_cost, best_node = cost, [guess, children]
+
+        if best_node is not None:
+            best_node.append(self.ranked(candidates, best_node[0]))
+
+        if best_cost is None:
+            # 沒有任何猜測能分開 (理論上不會發生)；逐一猜候選字
+            best_cost, best_node = FAIL_COST * size, None
+
+        if guess_options is None:
+            self._memo[key] = (best_cost, best_node)
+        return best_cost, best_node
+
+
+class StrategyTree:
+    """
+    序列化的策略樹。節點格式：
+    - "WORD": 只剩一個答案，直接猜
+    - ["GUESS", {"GXYXX": 子節點, ...}, [["GUESS", entropy], ["WORD", entropy], ...]]:
+      猜 GUESS，依回饋走到子節點 (GGGGG 不列出)；第三項是這個狀態的建議排名 (GUESS 排第一)，
+      讓 Tree 模式每回合直接顯示前幾名，不必重新計算 Entropy
+    """
+
+    def __init__(self, root, meta=None):
+        self.root = root
+        self.meta = meta or {}
+
+    def node_for(self, history):
+        """依照 (guess, feedback) 歷史往下走；走出樹外時回傳 None"""
+        node = self.root
+        for guess, feedback in history:
+            if node is None or isinstance(node, str):
+                return None
+            if node[0] != guess:
+                return None
+            node = node[1].get(feedback)
+        return node
+
+    def next_guess(self, history):
+        node = self.node_for(history)
+        if node is None:
+            return None
+        return node if isinstance(node, str) else node[0]
+
+    def suggestions(self, history):
+        """
+        回傳 (排名 [(word, score)], 是否為完整排名)；走出樹外時回傳 None。
+        只剩一個答案的節點直接猜它 (完整排名)；排名比保存的數量短代表 guess pool 已全部列出
+        """
+        node = self.node_for(history)
+        if node is None:
+            return None
+        if isinstance(node, str):
+            return [(node, CANDIDATE_BONUS)], True
+        ranked = [(word, score) for word, score in node[2]]
+        return ranked, len(ranked) < self.meta.get('alternatives', 0)
+
+    def save(self, path):
+        with atomic_write(path) as f:
+            json.dump({'version': TREE_VERSION, 'meta': self.meta, 'root': self.root}, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path, fingerprint=None):
+        """讀取策略樹；檔案不存在、版本不符或詞彙表 / 歷史答案已變動時回傳 None"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        if data.get('version') != TREE_VERSION:
+            return None
+        meta = data.get('meta', {})
+        if fingerprint is not None and meta.get('fingerprint') != fingerprint:
+            return None
+        return cls(data.get('root'), meta)
+
+
+def build_strategy_tree(words, past_answers, strategy='standard', beam=8, candidate_beam=3):
+    """
+    建立指定策略的策略樹：
+    - standard: 答案範圍 = 整個詞彙表
+    - exclude: 答案範圍 = 詞彙表 - 歷史答案
+    - hybrid: 第 1 猜依整個詞彙表挑選，之後答案範圍 = 詞彙表 - 歷史答案
+    """
+    solver = TreeSolver(words, beam=beam, candidate_beam=candidate_beam)
+    if strategy == 'standard':
+        candidates = list(words)
+        root_options = None
+    else:
+        candidates = [w for w in words if w not in past_answers]
+        root_options = solver._guess_options(list(words)) if strategy == 'hybrid' else None
+
+    cost, root = solver.solve(candidates, 0, root_options)
+    if strategy == 'hybrid' and isinstance(root, list):
+        # hybrid 的第 1 猜時還沒排除歷史答案，建議排名要以整個詞彙表計算
+        root[2] = solver.ranked(list(words), root[0])
+    size = len(candidates)
+    meta = {
+        'strategy': strategy,
+        'fingerprint': tree_fingerprint(words, past_answers, strategy),
+        'answers': size,
+        'total_guesses': cost,
+        'average_guesses': cost / size if size else 0,
+        'beam': beam,
+        'alternatives': solver.alternatives,
+        'nodes': solver.nodes,
+    }
+    return StrategyTree(root, meta)
+
+
+# 每個 process 只讀一次；詞彙表 / 歷史答案物件換掉 (檔案變動) 時重新讀取
+_trees = {}
+
+
+def get_strategy_tree(words, past_answers, strategy):
+    """取得目前資料對應的策略樹；尚未建立或已過期時回傳 None"""
+    entry = _trees.get(strategy)
+    if entry is not None and entry[0] is words and entry[1] is past_answers:
+        return entry[2]
+    tree = StrategyTree.load(tree_path(strategy), tree_fingerprint(words, past_answers, strategy))
+    _trees[strategy] = (words, past_answers, tree)
+    return tree
+
+
+def has_strategy_tree(strategy):
+    """目前的詞彙表 / 歷史答案是否已有建好的策略樹 (給 GUI / 網頁決定是否使用 Tree 模式)"""
+    try:
+        words = vocabulary_store.words()
+    except FileNotFoundError:
+        return False
+    try:
+        past_answers = vocabulary_store.past_answers()
+    except FileNotFoundError:
+        past_answers = frozenset()
+    return get_strategy_tree(words, past_answers, strategy) is not None
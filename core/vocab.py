@@ -0,0 +1,210 @@
+import bisect
+import csv
+import os
+import threading
+from . import config
+from .wordfile import WordFileError, read_word_file
+
+# pattern 查詢中代表任意字母的字元
+WILDCARDS = '_?.*'
+
+
+def _is_binary(path):
+    return os.fspath(path).endswith('.bin')
+
+
+def parse_words(path):
+    """詞彙表：單行 CSV 或二進位單字檔 (.bin)，回傳 list (保留原始順序)"""
+    if _is_binary(path):
+        return read_word_file(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        try:
+            row = next(reader)
+            return [word.strip() for word in row if word.strip()]
+        except StopIteration:
+            return []
+
+
+def parse_past_answers(path):
+    """歷史答案：逗號分隔或二進位單字檔 (.bin)，回傳大寫 set"""
+    if _is_binary(path):
+        return set(read_word_file(path))
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    if not content:
+        return set()
+    return {w.strip().upper() for w in content.split(',') if w.strip()}
+
+
+class VocabularyIndex:
+    """
+    詞彙表的查詢索引 (唯讀，process 共用)：
+    - word in index: O(1) (frozenset)
+    - prefix(): 字首查詢 (排序後的 tuple + bisect，網頁自動完成用)
+    - matching(): 位置 pattern 查詢 (例如 'CR_NE')，每個 (位置, 字母) 一個 bitset，取交集後再轉回單字
+    prefix / matching 不分大小寫，結果依字母順序 (membership 與詞彙表相同，為大寫)。
+    """
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self._set = frozenset(self.words)
+        self._sorted = tuple(sorted(self._set))
+        # _positions[i][letter]: 第 i 個字母為 letter 的單字 (_sorted 中的位置) bitset
+        self._positions = [{} for _ in range(5)]
+        for n, word in enumerate(self._sorted):
+            if len(word) != 5:
+                continue
+            for i, char in enumerate(word):
+                column = self._positions[i]
+                column[char] = column.get(char, 0) | (1 << n)
+
+    def __contains__(self, word):
+        return word in self._set
+
+    def __len__(self):
+        return len(self._set)
+
+    def prefix(self, prefix, limit=None):
+        """以 prefix 開頭的單字 (依字母順序，最多 limit 個)"""
+        prefix = prefix.strip().upper()
+        words = self._sorted
+        start = bisect.bisect_left(words, prefix)
+        end = len(words) if limit is None else min(len(words), start + limit)
+        result = []
+        for i in range(start, end):
+            if not words[i].startswith(prefix):
+                break
+            result.append(words[i])
+        return result
+
+    def matching(self, pattern, limit=None):
+        """
+        符合位置 pattern 的 5 字母單字，pattern 中的 '_' / '?' / '.' / '*' 代表任意字母
+        (例如 'CR_NE' -> CRANE, CRONE)。pattern 長度不是 5 時丟出 ValueError
+        """
+        pattern = pattern.strip().upper()
+        if len(pattern) != 5:
+            raise ValueError(f"Pattern must have 5 characters: {pattern!r}")
+        bits = None
+        for i, char in enumerate(pattern):
+            if char in WILDCARDS:
+                continue
+            column = self._positions[i].get(char, 0)
+            bits = column if bits is None else bits & column
+            if not bits:
+                return []
+        words = self._sorted
+        if bits is None:
+            # 全部都是萬用字元
+            result = [w for w in words if len(w) == 5]
+            return result if limit is None else result[:limit]
+        result = []
+        flags = bin(bits)[:1:-1]  # 反轉後第 n 個字元 = 第 n 個 bit (同 BitsetIndex.to_words)
+        n = flags.find('1')
+        while n >= 0 and (limit is None or len(result) < limit):
+            result.append(words[n])
+            n = flags.find('1', n + 1)
+        return result
+
+
+class VocabularyStore:
+    """
+    Process-wide 詞彙表快取。
+    每個檔案只解析一次，之後以 (mtime, size) 判斷檔案是否變動；
+    回傳的 tuple / frozenset 為所有 WordleHelper 共用，呼叫端不可修改。
+    未指定 path 時優先讀取轉換好的二進位檔 (convert_data.py)，不存在、比 CSV 舊或損毀時改讀 CSV。
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        # 已印過警告的二進位檔 (過期或損毀)，同一個檔案只提醒一次
+        self._warned = set()
+
+    def _get(self, kind, path, parser, wrap):
+        path = os.fspath(path)
+        stat = os.stat(path)  # 檔案不存在時丟出 FileNotFoundError
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (kind, path)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+            value = wrap(parser(path))
+            self._entries[key] = (stamp, value)
+            return value
+
+    def _binary_path(self, bin_path, csv_path):
+        """
+        二進位檔存在且不比 CSV 舊時回傳它，否則回傳 None。
+        CSV 是版本控制中的來源；被手動修改 (比二進位檔新) 時改讀 CSV，直到重新執行 convert_data.py
+        """
+        try:
+            bin_mtime = os.stat(bin_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        try:
+            csv_mtime = os.stat(csv_path).st_mtime_ns
+        except FileNotFoundError:
+            return bin_path
+        if csv_mtime > bin_mtime:
+            if bin_path not in self._warned:
+                self._warned.add(bin_path)
+                print(f"Warning: {csv_path} is newer than {bin_path}, reading the CSV (run convert_data.py to rebuild)")
+            return None
+        return bin_path
+
+    def _get_default(self, kind, path, bin_path, csv_path, parser, wrap):
+        if path:
+            return self._get(kind, path, parser, wrap)
+        bin_path = self._binary_path(bin_path, csv_path)
+        if bin_path is not None:
+            try:
+                return self._get(kind, bin_path, parser, wrap)
+            except WordFileError as e:
+                if bin_path not in self._warned:
+                    self._warned.add(bin_path)
+                    print(f"Warning: {e}, falling back to {csv_path}")
+        return self._get(kind, csv_path, parser, wrap)
+
+    def answers_path(self):
+        """目前預設使用的歷史答案檔案 (二進位檔過期時為 CSV)"""
+        return self._binary_path(config.PAST_ANSWERS_BIN_PATH, config.PAST_ANSWERS_PATH) or config.PAST_ANSWERS_PATH
+
+    def words(self, path=None):
+        """詞彙表 (tuple，依檔案順序)"""
+        return self._get_default('words', path, config.VOCAB_BIN_PATH, config.VOCAB_PATH, parse_words, tuple)
+
+    def index(self, path=None):
+        """詞彙表的 VocabularyIndex (檔案變動時重建)"""
+        words = self.words(path)
+        key = ('index', os.fspath(path if path else config.VOCAB_PATH))
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is not words:
+            entry = (words, VocabularyIndex(words))
+            self._entries[key] = entry
+        return entry[1]
+
+    def past_answers(self, path=None):
+        """歷史答案 (frozenset)"""
+        return self._get_default('answers', path, config.PAST_ANSWERS_BIN_PATH, config.PAST_ANSWERS_PATH,
+                                 parse_past_answers, frozenset)
+
+    def invalidate(self, path=None):
+        """強制下次重新讀取 (path=None 代表全部)"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                path = os.fspath(path)
+                for key in [k for k in self._entries if k[1] == path]:
+                    del self._entries[key]
+
+
+# 單一 process 共用的 store
+vocabulary_store = VocabularyStore()
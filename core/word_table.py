@@ -0,0 +1,88 @@
+from collections import Counter
+from .cache import VocabularyMemo
+from .constraints import Constraint
+from ._np import np
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class WordTable:
+    """
+    以連續記憶體保存的詞彙表 (process 共用、唯讀)：
+    - letters: N×5 uint8，A=0 ... Z=25
+    - counts: N×26 uint8，每個字母在單字中出現幾次
+    - index: word -> 列號
+    候選字集合以列號陣列 (np.intp，遞增) 表示 (由 WordleHelper 的 bitset 轉出)，
+    過濾、字母頻率統計與 Frequency 評分都是整批的向量運算。
+    """
+
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.size = len(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+
+        raw = np.frombuffer(''.join(self.words).encode('ascii'), dtype=np.uint8)
+        self.letters = (raw.reshape(self.size, 5) - ord('A')).astype(np.uint8)
+        self.counts = np.zeros((self.size, 26), dtype=np.uint8)
+        rows = np.repeat(np.arange(self.size), 5)
+        np.add.at(self.counts, (rows, self.letters.ravel()), 1)
+        # 每個單字含有哪些字母 (Unique Frequency 用)
+        self.presence = (self.counts > 0).astype(np.uint8)
+
+    @staticmethod
+    def supports(words):
+        """只收全大寫 A-Z 的 5 字母單字"""
+        return all(len(w) == 5 and w.isascii() and w.isalpha() and w.isupper() for w in words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    # --- 候選字集合運算 ---
+
+    def filter(self, indices, guess, feedback):
+        """保留與 (guess, feedback) 一致的列 (Constraint 的位置 mask 與字母上下限，向量化比對)"""
+        constraint = Constraint(guess, feedback)
+        letters = self.letters[indices]
+        keep = np.ones(len(indices), dtype=bool)
+        shifts = np.arange(26)
+        for i, mask in enumerate(constraint.position_masks):
+            allowed = ((mask >> shifts) & 1).astype(bool)
+            keep &= allowed[letters[:, i]]
+        counts = self.counts[indices]
+        for char, limit in constraint.min_counts.items():
+            keep &= counts[:, ord(char) - 65] >= limit
+        for char, limit in constraint.max_counts.items():
+            keep &= counts[:, ord(char) - 65] <= limit
+        return indices[keep]
+
+    # --- 頻率與評分 ---
+
+    def letter_counts(self, indices):
+        """26 維向量：含有每個字母的候選字數 (= _analyze_unique_char_freq)"""
+        return self.presence[indices].sum(axis=0, dtype=np.int64)
+
+    @staticmethod
+    def to_counter(letter_counts):
+        return Counter({ALPHABET[i]: int(c) for i, c in enumerate(letter_counts.tolist()) if c})
+
+    def unique_scores(self, indices, letter_counts):
+        """每個候選字的 Unique Frequency 分數：所含 (不重複) 字母的頻率總和"""
+        return self.presence[indices] @ letter_counts
+
+    def rank(self, indices, scores, top_k=None):
+        """依分數由高到低排序 (同分維持原順序，與 rank_scores 相同)，只轉出前 top_k 個單字"""
+        order = np.argsort(-scores, kind='stable')
+        if top_k is not None:
+            order = order[:top_k]
+        words = self.words
+        return [(words[i], s) for i, s in zip(indices[order].tolist(), scores[order].tolist())]
+
+
+_tables = VocabularyMemo(lambda key: WordTable(key) if key and WordTable.supports(key) else None)
+
+
+def get_word_table(words):
+    """取得詞彙表對應的 WordTable；沒有 NumPy 或有非標準單字時回傳 None"""
+    if np is None:
+        return None
+    return _tables.get(words)
@@ -0,0 +1,158 @@
+import hashlib
+import mmap
+import os
+import struct
+from .fileutil import atomic_write
+
+_MAGIC = b'WMWL'
+_VERSION = 1
+# magic, version, flags (保留), 已壓實的字數, checksum (blake2b-16，涵蓋字表與索引)
+_HEADER = struct.Struct('<4sHHI16s')
+_INDEX = struct.Struct('<I')
+WORD_SIZE = 5
+
+
+class WordFileError(ValueError):
+    """檔案格式錯誤 (magic / version / 長度 / checksum 不符)"""
+
+
+def _checksum(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def pack_words(words):
+    """單字 -> 每字 5 bytes 的 ASCII (大寫)；有不是 5 個英文字母的字時丟出 ValueError"""
+    packed = bytearray()
+    for word in words:
+        word = word.strip().upper()
+        if len(word) != WORD_SIZE or not (word.isascii() and word.isalpha()):
+            raise ValueError(f"Not a 5-letter word: {word!r}")
+        packed += word.encode('ascii')
+    return bytes(packed)
+
+
+class WordFile:
+    """
+    二進位單字檔，以 mmap 唯讀開啟：
+
+        header | 字表: count × 5 bytes | 索引: count × uint32 | 追加區: n × 5 bytes
+
+    - 字表保持原始順序 (詞彙表的順序決定 pattern 矩陣等快取的 key)
+    - 索引是依字母排序後的字表位置，查詢單字時二分搜尋，不必解碼整個檔案
+    - 追加區是 append_word 加入、尚未 compact 的字，不在 checksum 內；寫到一半的尾巴會被忽略
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise WordFileError(f"{self.path}: file too short")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, checksum = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise WordFileError(f"{self.path}: not a version {_VERSION} word file")
+        self.count = count
+        self._words_at = _HEADER.size
+        self._index_at = self._words_at + count * WORD_SIZE
+        self._tail_at = self._index_at + count * _INDEX.size
+        if size < self._tail_at:
+            self.close()
+            raise WordFileError(f"{self.path}: truncated")
+        if _checksum(self._map[self._words_at:self._tail_at]) != checksum:
+            self.close()
+            raise WordFileError(f"{self.path}: checksum mismatch")
+        self.appended = (size - self._tail_at) // WORD_SIZE
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def _word(self, offset):
+        return self._map[offset:offset + WORD_SIZE].decode('ascii')
+
+    def word(self, i):
+        """第 i 個字 (字表之後接追加區)"""
+        if i < self.count:
+            return self._word(self._words_at + i * WORD_SIZE)
+        return self._word(self._tail_at + (i - self.count) * WORD_SIZE)
+
+    def _sorted_word(self, rank):
+        (i,) = _INDEX.unpack_from(self._map, self._index_at + rank * _INDEX.size)
+        return self.word(i)
+
+    def words(self):
+        """全部的字 (字表順序，之後是追加區)"""
+        end = self._tail_at + self.appended * WORD_SIZE
+        data = self._map[self._words_at:self._index_at] + self._map[self._tail_at:end]
+        text = data.decode('ascii')
+        return [text[i:i + WORD_SIZE] for i in range(0, len(text), WORD_SIZE)]
+
+    def __len__(self):
+        return self.count + self.appended
+
+    def __contains__(self, word):
+        word = word.strip().upper()
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._sorted_word(mid) < word:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.count and self._sorted_word(low) == word:
+            return True
+        return any(self.word(i) == word for i in range(self.count, len(self)))
+
+
+def read_word_file(path):
+    with WordFile(path) as wf:
+        return wf.words()
+
+
+def write_word_file(path, words, sort=False):
+    """寫出壓實的單字檔 (先寫暫存檔再原子性替換；sort=True 時依字母排序並去除重複)"""
+    words = [w.strip().upper() for w in words]
+    if sort:
+        words = sorted(set(words))
+    data = pack_words(words)
+    order = sorted(range(len(words)), key=words.__getitem__)
+    index = b''.join(_INDEX.pack(i) for i in order)
+    body = data + index
+
+    with atomic_write(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, 0, len(words), _checksum(body)))
+        f.write(body)
+
+
+def compact(path, sort=True):
+    """把追加區併入字表並重建索引 (答案檔依字母排序)"""
+    write_word_file(path, read_word_file(path), sort=sort)
+
+
+def append_word(path, word, compact_threshold=None):
+    """
+    在檔尾追加一個字 (只寫 5 bytes，不重寫整個檔案)。
+    回傳 False 代表字已存在；追加區達 compact_threshold 個字時順便 compact。
+    """
+    word = word.strip().upper()
+    packed = pack_words([word])
+    with WordFile(path) as wf:
+        if word in wf:
+            return False
+        # 丟掉先前寫到一半的尾巴，新的字才會對齊
+        valid_end = wf._tail_at + wf.appended * WORD_SIZE
+        appended = wf.appended + 1
+    with open(path, 'r+b') as f:
+        f.truncate(valid_end)
+        f.seek(valid_end)
+        f.write(packed)
+    if compact_threshold is not None and appended >= compact_threshold:
+        compact(path)
+    return True
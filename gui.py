@@ -1,16 +1,101 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import queue
 import threading
 
 # 引用您的核心模組
 try:
-    from core.helper import WordleHelper, FREQ_ENTROPY
+    from core.helper import WordleHelper, FREQ_ENTROPY, FREQ_TREE
+    from core.solver import has_strategy_tree
 except ImportError:
     # fallback if run from inside a folder
     import sys
     import os
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-    from core.helper import WordleHelper, FREQ_ENTROPY
+    from core.helper import WordleHelper, FREQ_ENTROPY, FREQ_TREE
+    from core.solver import has_strategy_tree
+
+NUM_SUGGESTIONS = 20
+# 主執行緒檢查背景結果的間隔 (毫秒)
+POLL_INTERVAL_MS = 50
+
+
+class SuggestionWorker:
+    """
+    在背景 thread 計算建議，避免 Entropy 評分卡住視窗。
+    Tk 元件只能在主執行緒操作：worker 把結果放進 queue，由主執行緒以 root.after 輪詢後更新畫面。
+    每個工作有 generation 編號，送出新工作時舊工作會被取消 (在各階段之間檢查)，
+    已經算完但過期的結果也會在主執行緒丟棄。
+    """
+
+    def __init__(self):
+        self.results = queue.Queue()
+        self.generation = 0
+        self._cancel = None
+
+    def submit(self, job, *args):
+        """在新 thread 執行 job(post, cancel, *args)；post(kind, payload) 把結果交給主執行緒"""
+        self.cancel()
+        self.generation += 1
+        generation = self.generation
+        cancel = self._cancel = threading.Event()
+
+        def post(kind, payload):
+            if not cancel.is_set():
+                self.results.put((generation, kind, payload))
+
+        def run():
+            try:
+                job(post, cancel, *args)
+            except Exception as e:
+                post('error', e)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def cancel(self):
+        if self._cancel is not None:
+            self._cancel.set()
+            self._cancel = None
+
+    def poll(self):
+        """取出目前 generation 的結果 (主執行緒呼叫)"""
+        while True:
+            try:
+                generation, kind, payload = self.results.get_nowait()
+            except queue.Empty:
+                return
+            if generation == self.generation:
+                yield kind, payload
+
+
+def _rank_job(post, cancel, helper, applied):
+    """先送出快速的 Frequency 排名，再送出完整排名 (Entropy / 策略樹)"""
+    if helper.scores_pending:
+        post('quick', (helper, applied, helper.quick_guesses(NUM_SUGGESTIONS)))
+        if cancel.is_set():
+            return
+    post('ranked', (helper, applied, helper.get_top_guesses(NUM_SUGGESTIONS)))
+
+
+def _new_game_job(post, cancel, algo, exclude, hybrid):
+    helper = WordleHelper(mode=algo, exclude_history=exclude, hybrid_mode=hybrid)
+    if not cancel.is_set():
+        _rank_job(post, cancel, helper, 0)
+
+
+def _guess_job(post, cancel, base, steps, applied):
+    """從 base (已套用前 applied 手) 繼續套用 steps；base 不修改，在 clone 上計算"""
+    helper = base.clone()
+    for guess, feedback in steps:
+        if cancel.is_set():
+            return
+        applied += 1
+        # 混合模式：第 1 手之後排除歷史答案
+        if helper.hybrid_mode and applied == 1:
+            helper.exclude_past_answers(verbose=False, deferred=True)
+        helper.filter_words(guess, feedback, deferred=True)
+    _rank_job(post, cancel, helper, applied)
+
 
 class WordleSolverGUI:
     def __init__(self, root):
@@ -29,12 +114,17 @@ class WordleSolverGUI:
         }
         
         # 遊戲狀態
+        # helper 已套用 steps 的前 applied 手 (背景計算尚未完成的猜測不在其中)
         self.helper = None
+        self.applied = 0
+        self.steps = []
         self.attempt = 0
         self.current_feedback = ['X'] * 5  # 預設全灰
+        self.worker = SuggestionWorker()
         
         self._init_ui()
         self.start_new_game()
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker)
 
     def _init_ui(self):
         # 主框架：左右分割
@@ -150,27 +240,45 @@ class WordleSolverGUI:
         hybrid = (mode == "hybrid")
         
         self.status_var.set("Loading vocabulary...")
-        self.root.update()
         
-        try:
-            self.helper = WordleHelper(exclude_history=exclude, hybrid_mode=hybrid)
-            self.attempt = 0
-            self.update_suggestions()
-            self.clear_board()
-            self.reset_inputs()
-            
-            # 更新狀態文字
-            count = len(self.helper.words)
-            if hybrid:
-                msg = f"Hybrid Mode: {count} words. (Excludes history after guess #1)"
-            elif exclude:
-                msg = f"Wordle Mode: {count} words. (History excluded)"
-            else:
-                msg = f"Standard Mode: {count} words."
-            self.status_var.set(msg)
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to initialize helper: {e}")
+        # 有離線策略樹 (build_tree.py) 時直接走樹，每回合 O(1)；否則 Entropy (先顯示 Frequency 排名)
+        strategy = "exclude" if exclude else mode
+        algo = FREQ_TREE if has_strategy_tree(strategy) else FREQ_ENTROPY
+        
+        # 在背景建立 Helper (會取消尚未完成的計算)
+        self.helper = None
+        self.applied = 0
+        self.steps = []
+        self.attempt = 0
+        self.clear_board()
+        self.reset_inputs()
+        self.show_suggestions([])
+        self.worker.submit(_new_game_job, algo, exclude, hybrid)
+
+    def _mode_message(self, count):
+        if self.helper.hybrid_mode:
+            if self.applied == 0:
+                return f"Hybrid Mode: {count} words. (Excludes history after guess #1)"
+            return f"Hybrid Mode: Past answers excluded. {count} words remaining."
+        if self.helper.history_excluded:
+            return f"Wordle Mode: {count} words. (History excluded)"
+        return f"Standard Mode: {count} words."
+
+    def _poll_worker(self):
+        # 背景結果只在主執行緒套用到畫面
+        for kind, payload in self.worker.poll():
+            if kind == 'error':
+                messagebox.showerror("Error", f"Failed to compute suggestions: {payload}")
+                continue
+            helper, applied, suggestions = payload
+            self.helper = helper
+            self.applied = applied
+            self.show_suggestions(suggestions)
+            message = self._mode_message(len(helper.words))
+            if kind == 'quick':
+                message += " Ranking by entropy..."
+            self.status_var.set(message)
+        self.root.after(POLL_INTERVAL_MS, self._poll_worker)
 
     def clear_board(self):
         for row in self.rows:
@@ -210,13 +318,12 @@ class WordleSolverGUI:
             self.word_entry.delete(0, tk.END)
             self.word_entry.insert(0, clean_word)
 
-    def update_suggestions(self):
+    def show_suggestions(self, suggestions):
         self.suggest_list.delete(0, tk.END)
-        if not self.helper.words:
+        if self.helper is not None and not self.helper.words:
             self.suggest_list.insert(tk.END, "No possible words!")
             return
 
-        suggestions = self.helper.get_top_guesses(20)
         for i, word in enumerate(suggestions, 1):
             self.suggest_list.insert(tk.END, f"{i}. {word}")
 
@@ -232,6 +339,10 @@ class WordleSolverGUI:
             messagebox.showinfo("Game Over", "Max attempts reached. Start a new game.")
             return
 
+        if self.helper is None:
+            self.status_var.set("Still loading vocabulary, please wait...")
+            return
+
         # 更新盤面顯示
         row_widgets = self.rows[self.attempt]
         feedback_str = "".join(self.current_feedback)
@@ -243,43 +354,31 @@ class WordleSolverGUI:
 
         # 增加嘗試次數
         self.attempt += 1
+        self.steps.append((guess, feedback_str))
         
-        # --- 混合模式邏輯 ---
-        if self.helper.hybrid_mode and self.attempt == 1:
-            self.helper.exclude_past_answers()
-            self.status_var.set(f"Hybrid Mode: Past answers excluded. {len(self.helper.words)} words remaining.")
-        
-        # 執行過濾
-        try:
-            self.helper.filter_words(guess, feedback_str)
-            
-            # 更新建議
-            self.update_suggestions()
+        if feedback_str == "GGGGG":
+            # 已猜中，不需要再計算建議
+            self.worker.cancel()
+            messagebox.showinfo("Success", f"Congratulations! Word found: {guess}")
+            self.status_var.set("Solved!")
+
+            should_save = messagebox.askyesno(
+                "Update History", 
+                f"Do you want to add '{guess}' to the past answers list?\n(This will exclude it from future games)"
+            )
             
-            # 更新狀態列
-            remaining = len(self.helper.words)
-            if feedback_str == "GGGGG":
-                messagebox.showinfo("Success", f"Congratulations! Word found: {guess}")
-                self.status_var.set("Solved!")
-
-                should_save = messagebox.askyesno(
-                    "Update History", 
-                    f"Do you want to add '{guess}' to the past answers list?\n(This will exclude it from future games)"
-                )
-                
-                if should_save:
-                    success, msg = self.helper.save_new_answer(guess)
-                    if success:
-                        messagebox.showinfo("History Updated", msg)
-                    else:
-                        messagebox.showwarning("Update Skipped", msg)
-            else:
-                current_msg = self.status_var.get().split('.')[0]
-                self.status_var.set(f"{current_msg}. Remaining words: {remaining}")
-                self.reset_inputs()
-                
-        except Exception as e:
-            messagebox.showerror("Error", f"Error filtering words: {e}")
+            if should_save:
+                success, msg = self.helper.save_new_answer(guess)
+                if success:
+                    messagebox.showinfo("History Updated", msg)
+                else:
+                    messagebox.showwarning("Update Skipped", msg)
+            return
+
+        # 在背景過濾並計算建議 (取消上一手尚未完成的計算，從已完成的狀態接著套用)
+        self.status_var.set("Filtering...")
+        self.worker.submit(_guess_job, self.helper, self.steps[self.applied:], self.applied)
+        self.reset_inputs()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from perfstats import percentile
+
+
+class Player:
+    """一個模擬玩家 (各自的 cookie / session)：開新局，每手先取建議再猜第一名，直到猜中或用完次數"""
+
+    def __init__(self, base_url, stream, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.stream = stream
+        self.timeout = timeout
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+    def request(self, path, body=None):
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method='POST' if data is not None else 'GET')
+        if data is not None:
+            req.add_header('Content-Type', 'application/json')
+        return self.opener.open(req, timeout=self.timeout)
+
+    def suggestions(self, record):
+        """回傳建議清單；串流模式另外記錄第一筆事件的時間"""
+        start = time.perf_counter()
+        if not self.stream:
+            with self.request('/suggestions?offset=0&limit=10') as response:
+                data = json.load(response)
+            record('suggestions', time.perf_counter() - start)
+            return data['suggestions']
+
+        data = None
+        with self.request('/suggestions/stream?limit=10') as response:
+            for raw in response:
+                line = raw.decode('utf-8').strip()
+                if not line.startswith('data:'):
+                    continue
+                if data is None:
+                    record('stream_first', time.perf_counter() - start)
+                data = json.loads(line[5:])
+                if data.get('final'):
+                    break
+        record('stream_final', time.perf_counter() - start)
+        return data['suggestions'] if data else []
+
+    def play(self, record):
+        start = time.perf_counter()
+        with self.request('/new_game', {}) as response:
+            response.read()
+        record('new_game', time.perf_counter() - start)
+
+        for _ in range(6):
+            suggestions = self.suggestions(record)
+            if not suggestions:
+                return
+            start = time.perf_counter()
+            with self.request('/guess', {'guess': suggestions[0]}) as response:
+                result = json.load(response)
+            record('guess', time.perf_counter() - start)
+            if result.get('won') or result.get('lost'):
+                return
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a running WordMaster web app (app.py or async_app.py)')
+    parser.add_argument('--url', default='http://localhost:8000', help='Base URL of the running instance')
+    parser.add_argument('--players', type=int, default=20, help='Concurrent players (default: 20)')
+    parser.add_argument('--games', type=int, default=5, help='Games per player (default: 5)')
+    parser.add_argument('--stream', action='store_true', help='Use /suggestions/stream instead of /suggestions')
+    parser.add_argument('--timeout', type=float, default=30.0, help='Per-request timeout in seconds (default: 30)')
+    parser.add_argument('--output', default=None, help='Write results as JSON to this path')
+    args = parser.parse_args()
+
+    latencies = defaultdict(list)
+    errors = Counter()
+    lock = threading.Lock()
+
+    def record(name, seconds):
+        with lock:
+            latencies[name].append(seconds)
+
+    def run_player(_):
+        player = Player(args.url, args.stream, args.timeout)
+        for _ in range(args.games):
+            try:
+                player.play(record)
+            except urllib.error.HTTPError as e:
+                # 503 = 排隊已滿 (backpressure)，504 = 超過期限
+                with lock:
+                    errors[e.code] += 1
+            except (urllib.error.URLError, OSError) as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.players) as executor:
+        list(executor.map(run_player, range(args.players)))
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(samples) for samples in latencies.values())
+    results = {}
+    print(f"{'endpoint':<16}{'count':>8}{'median':>12}{'p90':>12}{'p99':>12}{'max':>12}")
+    for name, samples in sorted(latencies.items()):
+        ms = [s * 1000 for s in samples]
+        summary = results[name] = {
+            'count': len(ms),
+            'median_ms': statistics.median(ms),
+            'p90_ms': percentile(ms, 0.90),
+            'p99_ms': percentile(ms, 0.99),
+            'max_ms': max(ms),
+        }
+        print(f"{name:<16}{summary['count']:>8}{summary['median_ms']:>10.1f}ms{summary['p90_ms']:>10.1f}ms"
+              f"{summary['p99_ms']:>10.1f}ms{summary['max_ms']:>10.1f}ms")
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s), errors: {dict(errors) or 'none'}")
+
+    if args.output:
+        report = {
+            'url': args.url,
+            'players': args.players,
+            'games': args.games,
+            'stream': args.stream,
+            'elapsed_s': elapsed,
+            'requests': total,
+            'errors': {str(k): v for k, v in errors.items()},
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"已寫入 {args.output}")
+
+    if errors:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
 import argparse
-from core.helper import WordleHelper, FREQ_ENTROPY, FREQ_UNIQUE
+from core.helper import WordleHelper, FREQ_ENTROPY, FREQ_UNIQUE, FREQ_TREE, FREQ_LOOKAHEAD
 
 def main():
     parser = argparse.ArgumentParser(description='WordMaster: A Wordle assistant')
@@ -12,16 +12,23 @@ def main():
     group.add_argument('--hybrid', action='store_true', help='Hybrid Mode: Exclude past answers after 1st guess (Recommended)')
     
     # 演算法選項
-    parser.add_argument('--algo', choices=['entropy', 'unique'], default='entropy', help='Algorithm (entropy=Smart Entropy, unique=Char Frequency)')
+    parser.add_argument('--algo', choices=['entropy', 'unique', 'tree', 'lookahead'], default='entropy', help='Algorithm (entropy=Smart Entropy, unique=Char Frequency, tree=Strategy Tree from build_tree.py, lookahead=Two-ply Lookahead)')
+    parser.add_argument('--lookahead_ms', type=int, default=None, help='Time budget per turn for --algo lookahead (default: 200)')
+    parser.add_argument('--entropy_max_candidates', type=int, default=None, help='Use Char Frequency while more than N words remain (default: no limit)')
+    parser.add_argument('--profile', action='store_true', help='Print per-turn timings (filter / frequency / score / entropy ...)')
     
     args = parser.parse_args()
 
-    mode = FREQ_ENTROPY if args.algo == 'entropy' else FREQ_UNIQUE
+    modes = {'entropy': FREQ_ENTROPY, 'unique': FREQ_UNIQUE, 'tree': FREQ_TREE, 'lookahead': FREQ_LOOKAHEAD}
+    mode = modes[args.algo]
 
     helper = WordleHelper(
         mode=mode,
         exclude_history=args.wordle,
-        hybrid_mode=args.hybrid
+        hybrid_mode=args.hybrid,
+        entropy_max_candidates=args.entropy_max_candidates,
+        lookahead_budget=args.lookahead_ms / 1000 if args.lookahead_ms is not None else None,
+        on_turn=(lambda record: print(f"[Profile] {record.summary()}")) if args.profile else None
     )
     
     helper.play(num_suggestions=args.num_suggestions, quiet=args.quiet)
@@ -0,0 +1,12 @@
+def percentile(samples, q):
+    """
+    線性內插的百分位數 (q 介於 0 和 1 之間)。
+    只用標準函式庫：benchmark.py 與 loadtest.py 共用，壓測工具不必匯入 core / NumPy
+    """
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
@@ -0,0 +1,89 @@
+"""
+重複字母的過濾規則：對任何 (secret, guess)，過濾後的候選字必須剛好是
+「以 get_feedback 算出的回饋與實際回饋相同」的單字 (Gray 在 Green / Yellow 之後、兩個 Yellow 等)
+"""
+from collections import defaultdict
+
+import pytest
+
+from core.constraints import filter_candidates
+from core.helper import WordleHelper, FREQ_ENTROPY, FREQ_UNIQUE
+from core.patterns import get_pattern_matrix
+from core.simulation import get_feedback
+from core.vocab import vocabulary_store
+from core.word_table import get_word_table
+
+# 有重複字母的猜測字
+GUESSES = ('SPEED', 'EERIE', 'GEESE', 'LLAMA', 'ALLEY', 'MAMMA', 'ABBEY', 'SASSY')
+
+
+@pytest.fixture(scope='module')
+def words():
+    return vocabulary_store.words()
+
+
+def _mixed_repeat(guess, feedback):
+    """重複字母的顏色不全相同，或同一字母有兩個以上 Yellow"""
+    colors = defaultdict(list)
+    for char, color in zip(guess, feedback):
+        colors[char].append(color)
+    return any(len(set(c)) > 1 or c.count('Y') > 1 for c in colors.values() if len(c) > 1)
+
+
+def _cases(words):
+    """每個猜測字的 (guess, feedback, 預期候選字)，只取重複字母顏色混合的回饋"""
+    cases = []
+    for guess in GUESSES:
+        if guess not in words:
+            continue
+        groups = defaultdict(list)
+        for word in words:
+            groups[get_feedback(word, guess)].append(word)
+        cases += [(guess, fb, expected) for fb, expected in groups.items() if _mixed_repeat(guess, fb)]
+    return cases
+
+
+@pytest.mark.parametrize('secret, guess, feedback', [
+    ('ABIDE', 'SPEED', 'XXYXY'),  # 只有一個 E：第一個 E 是 Yellow，第二個 Gray
+    ('ERASE', 'SPEED', 'YXYYX'),  # 兩個 E 都是 Yellow
+    ('CREPT', 'SPEED', 'XYGXX'),  # Green 之後的 E 是 Gray
+])
+def test_reference_feedback(secret, guess, feedback):
+    assert get_feedback(secret, guess) == feedback
+
+
+def test_cases_cover_duplicate_rules(words):
+    cases = _cases(words)
+    assert len({guess for guess, _, _ in cases}) >= 4
+    assert any('G' in fb and 'X' in fb for _, fb, _ in cases)
+
+
+def test_constraint_filter(words):
+    for guess, feedback, expected in _cases(words):
+        assert filter_candidates(words, guess, feedback) == expected, (guess, feedback)
+
+
+def test_pattern_matrix_filter(words):
+    matrix = get_pattern_matrix(words)
+    for guess, feedback, expected in _cases(words):
+        assert filter_candidates(words, guess, feedback, matrix) == expected, (guess, feedback)
+
+
+def test_word_table_filter(words):
+    table = get_word_table(words)
+    if table is None:
+        pytest.skip('NumPy is not installed')
+    import numpy as np
+    indices = np.arange(len(words))
+    for guess, feedback, expected in _cases(words):
+        kept = table.filter(indices, guess, feedback)
+        assert [words[i] for i in kept.tolist()] == expected, (guess, feedback)
+
+
+@pytest.mark.parametrize('mode', [FREQ_UNIQUE, FREQ_ENTROPY])
+def test_helper_filter_words(words, mode):
+    root = WordleHelper(mode=mode, opening_book=False, verbose=False)
+    for guess, feedback, expected in _cases(words):
+        helper = root.clone()
+        helper.filter_words(guess, feedback, deferred=True)
+        assert sorted(helper.words) == sorted(expected), (guess, feedback)
@@ -0,0 +1,109 @@
+import pytest
+
+from core.wordfile import (
+    WORD_SIZE, WordFile, WordFileError, append_word, compact, read_word_file, write_word_file,
+)
+
+WORDS = ['crane', 'ABACK', 'zesty', 'Mamma', 'SPEED']
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'words.bin'
+
+
+def test_round_trip_keeps_order(path):
+    write_word_file(path, WORDS)
+    assert read_word_file(path) == [w.upper() for w in WORDS]
+    with WordFile(path) as wf:
+        assert len(wf) == len(WORDS)
+        assert wf.appended == 0
+        assert 'crane' in wf and 'MAMMA' in wf
+        assert 'ADIEU' not in wf
+
+
+def test_round_trip_sorted_removes_duplicates(path):
+    write_word_file(path, WORDS + ['crane'], sort=True)
+    assert read_word_file(path) == sorted({w.upper() for w in WORDS})
+
+
+def test_write_rejects_bad_words(path):
+    with pytest.raises(ValueError):
+        write_word_file(path, ['CRANE', 'TOOLONG'])
+    assert not path.exists()
+
+
+def test_append_then_compact(path):
+    write_word_file(path, ['CRANE', 'SPEED'], sort=True)
+    assert append_word(path, 'zesty')
+    assert append_word(path, 'ABACK')
+    assert not append_word(path, 'crane')  # 字表裡已有
+    assert not append_word(path, 'ZESTY')  # 追加區裡已有
+
+    with WordFile(path) as wf:
+        assert wf.count == 2
+        assert wf.appended == 2
+        assert 'ZESTY' in wf
+    assert read_word_file(path) == ['CRANE', 'SPEED', 'ZESTY', 'ABACK']
+
+    compact(path)
+    with WordFile(path) as wf:
+        assert wf.count == 4
+        assert wf.appended == 0
+        assert wf.words() == ['ABACK', 'CRANE', 'SPEED', 'ZESTY']
+
+
+def test_append_compacts_at_threshold(path):
+    write_word_file(path, ['CRANE'])
+    append_word(path, 'SPEED', compact_threshold=2)
+    with WordFile(path) as wf:
+        assert wf.appended == 1
+    append_word(path, 'ABACK', compact_threshold=2)
+    with WordFile(path) as wf:
+        assert (wf.count, wf.appended) == (3, 0)
+        assert wf.words() == ['ABACK', 'CRANE', 'SPEED']
+
+
+def test_partial_tail_is_ignored_and_overwritten(path):
+    write_word_file(path, ['CRANE'])
+    with open(path, 'ab') as f:
+        f.write(b'SPE')  # 寫到一半的追加
+    assert read_word_file(path) == ['CRANE']
+
+    assert append_word(path, 'ZESTY')
+    assert read_word_file(path) == ['CRANE', 'ZESTY']
+    with WordFile(path) as wf:
+        assert path.stat().st_size == wf._tail_at + wf.appended * WORD_SIZE
+
+
+@pytest.mark.parametrize('offset, value', [
+    (0, b'XXXX'),  # magic
+    (4, b'\x09\x00'),  # version
+])
+def test_corrupt_header(path, offset, value):
+    write_word_file(path, WORDS)
+    data = bytearray(path.read_bytes())
+    data[offset:offset + len(value)] = value
+    path.write_bytes(bytes(data))
+    with pytest.raises(WordFileError):
+        WordFile(path)
+
+
+def test_checksum_mismatch(path):
+    write_word_file(path, WORDS)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF  # 索引的最後一個 byte
+    path.write_bytes(bytes(data))
+    with pytest.raises(WordFileError, match='checksum'):
+        WordFile(path)
+
+
+def test_truncated(path):
+    write_word_file(path, WORDS)
+    data = path.read_bytes()
+    path.write_bytes(data[:-2])
+    with pytest.raises(WordFileError, match='truncated'):
+        WordFile(path)
+    path.write_bytes(data[:10])
+    with pytest.raises(WordFileError, match='too short'):
+        WordFile(path)
@@ -1,74 +1,75 @@
+import argparse
 import time
 import statistics
 import copy
+from multiprocessing import Pool
 from core.helper import WordleHelper
+from core.simulation import simulate_many
 from core import config
 
-def get_feedback(secret, guess):
-    """產生 Wordle 回饋 (G=Green, Y=Yellow, X=Gray)"""
-    feedback = ['X'] * 5
-    secret_list = list(secret)
-    guess_list = list(guess)
-    
-    # 1. 處理綠色 (G)
-    for i in range(5):
-        if guess_list[i] == secret_list[i]:
-            feedback[i] = 'G'
-            secret_list[i] = None
-            guess_list[i] = None
-            
-    # 2. 處理黃色 (Y)
-    for i in range(5):
-        if guess_list[i] is not None and guess_list[i] in secret_list:
-            feedback[i] = 'Y'
-            # 移除 secret 中的對應字母確保不會重複匹配
-            secret_list[secret_list.index(guess_list[i])] = None
-            
-    return "".join(feedback)
+# --- 平行模擬 ---
+# 每個 worker process 只在啟動時收到一次歷史答案，之後只傳 secret 分片
+_worker_past_answers = None
+
+def _init_worker(past_answers):
+    global _worker_past_answers
+    _worker_past_answers = past_answers
+
+def _simulate_shard(task):
+    strategy_type, switch_after, shard = task
+    start_time = time.time()
+    # 同一分片內，開局與回饋相同的局共用中間狀態
+    result = simulate_many(shard, strategy_type, switch_after=switch_after, past_answers=_worker_past_answers)
+    return result.guesses, time.time() - start_time
 
-def simulate_game(secret, strategy_type, past_answers_set, switch_after=0):
+def _split_shards(items, num_shards):
+    """切成連續的分片 (保留原始順序，彙整結果時才能與單程序完全一致)"""
+    size = max(1, -(-len(items) // num_shards))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def run_strategy(secrets, strategy_type, past_answers, switch_after=0, pool=None, workers=1):
     """
-    模擬一局遊戲
-    :param strategy_type: 'standard', 'exclude', 'hybrid'
-    :param switch_after: 僅用於 hybrid 模式，表示在第幾次猜測後排除歷史答案
+    對所有 secrets 模擬一種策略
+    :return: (每個 secret 的猜測次數 (與 secrets 同順序), 各分片耗時總和)
     """
-    # 初始設定：Hybrid 模式一開始也是 Standard (不排除歷史)
-    initial_exclude = True if strategy_type == 'exclude' else False
-    helper = WordleHelper(exclude_history=initial_exclude)
+    if pool is None or workers <= 1:
+        _init_worker(past_answers)
+        return _simulate_shard((strategy_type, switch_after, secrets))
+
+    # 分片數多於 worker 數，讓較慢的分片不會拖住整體
+    shards = _split_shards(secrets, workers * 4)
+    tasks = [(strategy_type, switch_after, shard) for shard in shards]
+    guesses = []
+    cpu_time = 0.0
+    # imap 依分片順序回傳，彙整結果具決定性
+    for shard_results, shard_time in pool.imap(_simulate_shard, tasks):
+        guesses.extend(shard_results)
+        cpu_time += shard_time
+    return guesses, cpu_time
+
+def report_strategy(name, secrets, guesses_record, failures, duration, cpu_time, workers, results):
+    avg_guesses = statistics.mean(guesses_record) if guesses_record else 0
+    success_rate = (len(secrets) - failures) / len(secrets) * 100
     
-    attempts = 0
-    max_attempts = 6
+    results[name] = avg_guesses
     
-    while attempts < max_attempts:
-        attempts += 1
-        
-        # --- 混合策略的核心邏輯 ---
-        # 如果是 Hybrid 模式，且剛好達到切換點（例如 switch_after=1，代表第1次猜完後，第2次猜之前）
-        if strategy_type == 'hybrid' and attempts == (switch_after + 1):
-            # 手動執行排除歷史答案的操作
-            original_len = len(helper.words)
-            helper.words = [w for w in helper.words if w not in past_answers_set]
-            
-            # 如果詞彙表有變動，必須重新計算分數
-            if len(helper.words) != original_len:
-                helper.char_count = helper.analyze_freq()
-                helper.word_scores = helper.score(helper.mode, helper.words, helper.char_count)
-
-        guess = helper.get_best_guess()
-        
-        if guess is None:
-            return max_attempts + 1  # 失敗
-        
-        if guess == secret:
-            return attempts
-            
-        # 產生回饋並過濾
-        feedback = get_feedback(secret, guess)
-        helper.filter_words(guess, feedback)
-        
-    return max_attempts + 1  # 失敗
+    # 猜測次數分布
+    distribution = [guesses_record.count(n) for n in range(1, 7)]
+    
+    print(f"  -> 平均猜測: {avg_guesses:.4f}")
+    print(f"  -> 成功率: {success_rate:.2f}% (失敗: {failures})")
+    print(f"  -> 分布 (1-6): {distribution}")
+    if workers > 1:
+        print(f"  -> 耗時: {duration:.2f} 秒 (CPU 總計 {cpu_time:.2f} 秒, {workers} workers)")
+    else:
+        print(f"  -> 耗時: {duration:.2f} 秒")
+    print("-" * 60)
 
 def main():
+    parser = argparse.ArgumentParser(description='WordMaster strategy A/B test')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes (default: 1, serial)')
+    args = parser.parse_args()
+
     print("正在讀取資料...")
     # 1. 讀取所有單字與過往答案
     all_words = WordleHelper.read_words()
@@ -100,31 +101,23 @@ def main():
     ]
     
     results = {}
+    workers = max(1, args.workers)
+    pool = Pool(workers, initializer=_init_worker, initargs=(past_answers,)) if workers > 1 else None
 
-    for name, s_type, switch_val in strategies:
-        print(f"測試中: {name} ...")
-        start_time = time.time()
-        guesses_record = []
-        failures = 0
-        
-        for secret in future_secrets:
-            guesses = simulate_game(secret, s_type, past_answers, switch_after=switch_val)
-            
-            if guesses > 6:
-                failures += 1
-            else:
-                guesses_record.append(guesses)
-                
-        duration = time.time() - start_time
-        avg_guesses = statistics.mean(guesses_record) if guesses_record else 0
-        success_rate = (len(future_secrets) - failures) / len(future_secrets) * 100
-        
-        results[name] = avg_guesses
-        
-        print(f"  -> 平均猜測: {avg_guesses:.4f}")
-        print(f"  -> 成功率: {success_rate:.2f}% (失敗: {failures})")
-        print(f"  -> 耗時: {duration:.2f} 秒")
-        print("-" * 60)
+    try:
+        for name, s_type, switch_val in strategies:
+            print(f"測試中: {name} ...")
+            start_time = time.time()
+            all_guesses, cpu_time = run_strategy(future_secrets, s_type, past_answers, switch_after=switch_val, pool=pool, workers=workers)
+            duration = time.time() - start_time
+
+            guesses_record = [g for g in all_guesses if g <= 6]
+            failures = len(all_guesses) - len(guesses_record)
+            report_strategy(name, future_secrets, guesses_record, failures, duration, cpu_time, workers, results)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     # 最終比較
     print("\n=== 策略排名 (平均猜測次數，越低越好) ===")